@@ -3,26 +3,203 @@
 Smart Contract Deployer - Deploy and interact with Ethereum contracts
 """
 
+import functools
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# Prefer the pysha3 C backend for eth-hash when available (see wallet_manager)
+try:
+    import sha3  # noqa: F401
+    os.environ.setdefault('ETH_HASH_BACKEND', 'pysha3')
+except ImportError:
+    pass
+os.environ.setdefault('ECC_BACKEND_CLASS', 'eth_keys.backends.CoinCurveECCBackend')
+
 from web3 import Web3
 from eth_account import Account
 from solcx import compile_source, install_solc, get_installed_solc_versions
 
+from wallet_manager import (
+    HTTP_TIMEOUT, SessionHTTPProvider, abi_digest, make_http_session, to_checksum_address
+)
+
+
+SOLC_VERSION = '0.8.20'
+SOLC_CACHE_DIR = Path(
+    os.getenv('ETHSOLD_CACHE_DIR', Path.home() / '.cache' / 'ethsold')
+) / 'solc'
+# Module-level and memoized, unlike the Web3.to_checksum_address method
+_checksum = to_checksum_address
+
+# Gas price moves slowly relative to a deployment script, so reuse it briefly
+GAS_PRICE_TTL = 3.0
+# Encoded calldata kept per deployer before the oldest entries are dropped
+CALLDATA_CACHE_SIZE = 1024
+
+# Populated on first use so repeated compilations skip the solcx directory scan
+_installed_solc_versions: set[str] | None = None
+
+
+def _ensure_solc(solc_version: str) -> None:
+    """Install the requested solc version unless it is already available"""
+    global _installed_solc_versions
+    if _installed_solc_versions is None:
+        _installed_solc_versions = {str(v) for v in get_installed_solc_versions()}
+    if solc_version not in _installed_solc_versions:
+        print(f"Installing Solidity compiler {solc_version}...")
+        install_solc(solc_version)
+        _installed_solc_versions.add(solc_version)
+
+
+def _cache_file(source_code: str, contract_name: str, solc_version: str) -> Path:
+    """Hash the compiler inputs into a stable on-disk cache path"""
+    digest = hashlib.sha3_256(f"{solc_version}:{contract_name}:".encode())
+    digest.update(source_code.encode())
+    return SOLC_CACHE_DIR / f"{digest.hexdigest()}.json"
+
+
+def _read_cache(cache_file: Path) -> tuple[list, str] | None:
+    """Load cached (abi, bytecode), or None when missing or unreadable"""
+    try:
+        with open(cache_file) as f:
+            cached = json.load(f)
+        return cached['abi'], cached['bin']
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+@functools.lru_cache(maxsize=32)
+def _compile_cached(source_code: str, contract_name: str, solc_version: str) -> tuple[list, str]:
+    """
+    Compile a contract, reusing earlier results from memory or disk
+
+    Args:
+        source_code: Solidity source code
+        contract_name: Name of the contract
+        solc_version: Solidity compiler version
+
+    Returns:
+        Tuple of (abi, bytecode)
+    """
+    cache_file = _cache_file(source_code, contract_name, solc_version)
+    cached = _read_cache(cache_file)
+    if cached is not None:
+        return cached
+
+    _ensure_solc(solc_version)
+    compiled_sol = compile_source(
+        source_code,
+        output_values=['abi', 'bin'],
+        solc_version=solc_version
+    )
+    contract_interface = compiled_sol[f'<stdin>:{contract_name}']
+    abi, bytecode = contract_interface['abi'], contract_interface['bin']
+
+    # Write to a temp file first so concurrent runs never read a partial entry
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_suffix(f'.{os.getpid()}.tmp')
+        with open(tmp_file, 'w') as f:
+            json.dump({'abi': abi, 'bin': bytecode}, f)
+        os.replace(tmp_file, cache_file)
+    except OSError:
+        pass
+
+    return abi, bytecode
+
 
 class ContractDeployer:
     """Deploy and interact with smart contracts"""
 
-    def __init__(self, rpc_url: str, private_key: str):
-        self.w3 = Web3(Web3.HTTPProvider(rpc_url))
+    def __init__(
+        self,
+        rpc_url: str,
+        private_key: str,
+        poll_latency: float = 0.5,
+        pool_size: int = 32
+    ):
+        """
+        Initialize deployer with RPC connection and signing account
+
+        Args:
+            rpc_url: Ethereum node RPC URL
+            private_key: Deployer's private key
+            poll_latency: Seconds between receipt polls (use ~0.1 for local nodes)
+            pool_size: Maximum pooled HTTP connections to the node, shared by all threads
+        """
+        self.w3 = Web3(SessionHTTPProvider(
+            rpc_url,
+            make_http_session(pool_size),
+            request_kwargs={'timeout': HTTP_TIMEOUT}
+        ))
         self.account = Account.from_key(private_key)
         self.address = self.account.address
+        # Bound signer avoids rebuilding an Account from the key for every tx
+        self.sign_tx = self.account.sign_transaction
+        self.poll_latency = poll_latency
 
         if not self.w3.is_connected():
             raise ConnectionError("Failed to connect to Ethereum node")
 
+        # Chain ID is fixed for an endpoint; gas price is cached as (timestamp, wei)
+        self._chain_id = self.w3.eth.chain_id
+        self._gas_price_cache = (0.0, 0)
+        # Contracts keyed by (address, ABI digest); see _get_contract
+        self._contract_cache = {}
+        # Calldata keyed by (contract, function, typed arguments); see _encode_call
+        self._calldata_cache = {}
+        self._calldata_lock = threading.Lock()
+
+    def _cached_gas_price(self) -> int:
+        """Return the network gas price, refreshing it at most every GAS_PRICE_TTL seconds"""
+        fetched_at, gas_price = self._gas_price_cache
+        now = time.monotonic()
+        if not gas_price or now - fetched_at >= GAS_PRICE_TTL:
+            gas_price = self.w3.eth.gas_price
+            self._gas_price_cache = (now, gas_price)
+        return gas_price
+
+    def _get_contract(self, contract_address: str, abi: list):
+        """Return a Contract for the address and ABI, reusing an earlier instance"""
+        address = _checksum(contract_address)
+        key = (address, abi_digest(abi))
+        contract = self._contract_cache.get(key)
+        if contract is None:
+            contract = self._contract_cache[key] = self.w3.eth.contract(address=address, abi=abi)
+        return contract
+
+    def _encode_call(self, contract, function_name: str, args: tuple) -> str:
+        """ABI-encode calldata once per (contract, function, arguments)"""
+        # Pair each argument with its type so 1 and True (equal, same hash) don't
+        # share an entry and skip encodeABI's type validation
+        try:
+            key = (contract, function_name, tuple((type(arg), arg) for arg in args))
+            data = self._calldata_cache.get(key)
+        except TypeError:
+            # Unhashable arguments (e.g. lists) can't be cached
+            return contract.encodeABI(fn_name=function_name, args=list(args))
+        if data is None:
+            data = contract.encodeABI(fn_name=function_name, args=list(args))
+            # Locked so concurrent misses don't both evict the same oldest entry
+            with self._calldata_lock:
+                if len(self._calldata_cache) >= CALLDATA_CACHE_SIZE:
+                    del self._calldata_cache[next(iter(self._calldata_cache))]
+                self._calldata_cache[key] = data
+        return data
+
     def compile_contract(self, source_code: str, contract_name: str) -> tuple[list, str]:
         """
         Compile Solidity source code
 
+        Results are cached in-process and under SOLC_CACHE_DIR, keyed by
+        compiler version, source hash and contract name, so unchanged
+        sources skip solc entirely.
+
         Args:
             source_code: Solidity source code
             contract_name: Name of the contract
@@ -30,21 +207,45 @@ class ContractDeployer:
         Returns:
             Tuple of (abi, bytecode)
         """
-        # Install specific Solidity version if needed (only if not already installed)
-        from packaging import version as pkg_version
-        solc_version = '0.8.20'
-        installed_versions = get_installed_solc_versions()
-        if not any(str(v) == solc_version for v in installed_versions):
-            print(f"Installing Solidity compiler {solc_version}...")
-            install_solc(solc_version)
-
-        compiled_sol = compile_source(
-            source_code,
-            output_values=['abi', 'bin']
-        )
+        return _compile_cached(source_code, contract_name, SOLC_VERSION)
 
-        contract_interface = compiled_sol[f'<stdin>:{contract_name}']
-        return contract_interface['abi'], contract_interface['bin']
+    def compile_contracts(self, sources: dict[str, str]) -> dict[str, tuple[list, str]]:
+        """
+        Compile several contracts, running cache misses in parallel processes
+
+        Args:
+            sources: Mapping of contract name to Solidity source code
+
+        Returns:
+            Mapping of contract name to (abi, bytecode)
+        """
+        results = {}
+        pending = {}
+        for contract_name, source_code in sources.items():
+            cached = _read_cache(_cache_file(source_code, contract_name, SOLC_VERSION))
+            if cached is not None:
+                results[contract_name] = cached
+            else:
+                pending[contract_name] = source_code
+
+        if len(pending) == 1:
+            contract_name, source_code = pending.popitem()
+            results[contract_name] = _compile_cached(source_code, contract_name, SOLC_VERSION)
+        elif pending:
+            # Install solc once up front instead of racing installs in every worker
+            _ensure_solc(SOLC_VERSION)
+            max_workers = min(len(pending), os.cpu_count() or 1)
+            with ProcessPoolExecutor(max_workers=max_workers) as pool:
+                futures = {
+                    contract_name: pool.submit(
+                        _compile_cached, source_code, contract_name, SOLC_VERSION
+                    )
+                    for contract_name, source_code in pending.items()
+                }
+                for contract_name, future in futures.items():
+                    results[contract_name] = future.result()
+
+        return {contract_name: results[contract_name] for contract_name in sources}
 
     def deploy_contract(self, abi: list[dict], bytecode: str, *constructor_args) -> str:
         """
@@ -60,22 +261,30 @@ class ContractDeployer:
         """
         contract = self.w3.eth.contract(abi=abi, bytecode=bytecode)
 
-        # Build deployment transaction
+        # Assemble the deployment transaction directly; every field is known,
+        # so build_transaction's default-filling pass is unnecessary
         nonce = self.w3.eth.get_transaction_count(self.address)
-        tx = contract.constructor(*constructor_args).build_transaction({
+        tx = {
             'from': self.address,
+            'data': contract.constructor(*constructor_args).data_in_transaction,
+            'value': 0,
             'nonce': nonce,
             'gas': 3000000,
-            'gasPrice': self.w3.eth.gas_price
-        })
+            'gasPrice': self._cached_gas_price(),
+            'chainId': self._chain_id
+        }
 
         # Sign and send
-        signed_tx = self.w3.eth.account.sign_transaction(tx, self.account.key)
+        signed_tx = self.sign_tx(tx)
         tx_hash = self.w3.eth.send_raw_transaction(signed_tx.rawTransaction)
 
         # Wait for receipt
         print(f"⏳ Waiting for deployment... TX: {tx_hash.hex()}")
-        receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash)
+        receipt = self.w3.eth.wait_for_transaction_receipt(
+            tx_hash,
+            timeout=120,
+            poll_latency=self.poll_latency
+        )
 
         contract_address = receipt['contractAddress']
         print(f"✅ Contract deployed at: {contract_address}")
@@ -101,10 +310,7 @@ class ContractDeployer:
         Returns:
             Function return value (type depends on contract function)
         """
-        contract = self.w3.eth.contract(
-            address=self.w3.to_checksum_address(contract_address),
-            abi=abi
-        )
+        contract = self._get_contract(contract_address, abi)
         return getattr(contract.functions, function_name)(*args).call()
 
     def send_transaction(
@@ -115,20 +321,22 @@ class ContractDeployer:
         *args
     ) -> str:
         """Send a state-changing transaction"""
-        contract = self.w3.eth.contract(
-            address=self.w3.to_checksum_address(contract_address),
-            abi=abi
-        )
+        contract = self._get_contract(contract_address, abi)
+        data = self._encode_call(contract, function_name, args)
 
         nonce = self.w3.eth.get_transaction_count(self.address)
-        tx = getattr(contract.functions, function_name)(*args).build_transaction({
+        tx = {
             'from': self.address,
+            'to': contract.address,
+            'data': data,
+            'value': 0,
             'nonce': nonce,
             'gas': 200000,
-            'gasPrice': self.w3.eth.gas_price
-        })
+            'gasPrice': self._cached_gas_price(),
+            'chainId': self._chain_id
+        }
 
-        signed_tx = self.w3.eth.account.sign_transaction(tx, self.account.key)
+        signed_tx = self.sign_tx(tx)
         tx_hash = self.w3.eth.send_raw_transaction(signed_tx.rawTransaction)
 
         return tx_hash.hex()
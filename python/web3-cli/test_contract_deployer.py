@@ -0,0 +1,196 @@
+"""
+Unit tests for ContractDeployer
+"""
+
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock, PropertyMock, patch
+import contract_deployer
+from contract_deployer import ContractDeployer, SIMPLE_TOKEN
+
+
+PRIVATE_KEY = '0x' + '1' * 64
+RECIPIENT = '0x5aAeb6053F3E94C9b9A09f33669435E7Ef1BeAed'
+
+
+@pytest.fixture(autouse=True)
+def solc_cache(tmp_path, monkeypatch):
+    """Isolate the compilation cache for each test"""
+    monkeypatch.setattr(contract_deployer, 'SOLC_CACHE_DIR', tmp_path / 'solc')
+    monkeypatch.setattr(contract_deployer, '_installed_solc_versions', {'0.8.20'})
+    contract_deployer._compile_cached.cache_clear()
+    yield tmp_path / 'solc'
+    contract_deployer._compile_cached.cache_clear()
+
+
+def make_deployer(mock_web3):
+    web3_instance = Mock()
+    web3_instance.is_connected.return_value = True
+    mock_web3.return_value = web3_instance
+    return ContractDeployer("http://localhost:8545", PRIVATE_KEY)
+
+
+class TestContractDeployer:
+    """Test suite for ContractDeployer class"""
+
+    @patch('contract_deployer.compile_source')
+    @patch('contract_deployer.Web3')
+    def test_compile_contract_uses_memory_cache(self, mock_web3, mock_compile):
+        """Repeated compilations of the same source should invoke solc once"""
+        mock_compile.return_value = {
+            '<stdin>:SimpleToken': {'abi': [{'type': 'constructor'}], 'bin': '6080'}
+        }
+        deployer = make_deployer(mock_web3)
+
+        first = deployer.compile_contract(SIMPLE_TOKEN, 'SimpleToken')
+        second = deployer.compile_contract(SIMPLE_TOKEN, 'SimpleToken')
+
+        assert first == ([{'type': 'constructor'}], '6080')
+        assert second == first
+        mock_compile.assert_called_once()
+
+    @patch('contract_deployer.compile_source')
+    @patch('contract_deployer.Web3')
+    def test_compile_contract_uses_disk_cache(self, mock_web3, mock_compile, solc_cache):
+        """A fresh process should reuse artifacts persisted on disk"""
+        mock_compile.return_value = {
+            '<stdin>:SimpleToken': {'abi': [], 'bin': '6080'}
+        }
+        deployer = make_deployer(mock_web3)
+        deployer.compile_contract(SIMPLE_TOKEN, 'SimpleToken')
+        assert len(list(solc_cache.glob('*.json'))) == 1
+
+        contract_deployer._compile_cached.cache_clear()
+        abi, bytecode = deployer.compile_contract(SIMPLE_TOKEN, 'SimpleToken')
+
+        assert (abi, bytecode) == ([], '6080')
+        mock_compile.assert_called_once()
+
+    @patch('contract_deployer.compile_source')
+    @patch('contract_deployer.Web3')
+    def test_compile_contract_cache_miss_on_source_change(self, mock_web3, mock_compile):
+        """Changing the source must trigger a new compilation"""
+        mock_compile.return_value = {
+            '<stdin>:SimpleToken': {'abi': [], 'bin': '6080'}
+        }
+        deployer = make_deployer(mock_web3)
+
+        deployer.compile_contract(SIMPLE_TOKEN, 'SimpleToken')
+        deployer.compile_contract(SIMPLE_TOKEN + '\n// changed', 'SimpleToken')
+
+        assert mock_compile.call_count == 2
+
+    @patch('contract_deployer.compile_source')
+    @patch('contract_deployer.Web3')
+    def test_compile_contracts_parallel_and_cached(self, mock_web3, mock_compile, solc_cache):
+        """Cache misses compile in the worker pool; hits skip the pool"""
+        mock_compile.side_effect = lambda source, **kwargs: {
+            f'<stdin>:{name}': {'abi': [], 'bin': name}
+            for name in ('SimpleToken', 'OtherToken')
+        }
+        deployer = make_deployer(mock_web3)
+        sources = {
+            'SimpleToken': SIMPLE_TOKEN,
+            'OtherToken': SIMPLE_TOKEN.replace('SimpleToken', 'OtherToken'),
+        }
+
+        # Threads stand in for processes: patched compile_source only exists in this
+        # process, and spawn-based platforms would re-import it unpatched
+        with patch('contract_deployer.ProcessPoolExecutor', wraps=ThreadPoolExecutor) as pool:
+            compiled = deployer.compile_contracts(sources)
+            pool.assert_called_once()
+
+        assert compiled == {'SimpleToken': ([], 'SimpleToken'), 'OtherToken': ([], 'OtherToken')}
+        assert len(list(solc_cache.glob('*.json'))) == 2
+
+        with patch('contract_deployer.ProcessPoolExecutor') as mock_pool:
+            assert deployer.compile_contracts(sources) == compiled
+            mock_pool.assert_not_called()
+
+    @patch('contract_deployer.Web3')
+    def test_send_transaction_reuses_calldata(self, mock_web3):
+        """Repeated sends should encode calldata once and skip build_transaction"""
+        web3_instance = Mock()
+        web3_instance.is_connected.return_value = True
+        web3_instance.eth.chain_id = 1
+        web3_instance.eth.gas_price = 10
+        web3_instance.eth.get_transaction_count.return_value = 0
+        web3_instance.eth.send_raw_transaction.return_value = b'\x12\x34'
+        contract = web3_instance.eth.contract.return_value
+        contract.address = RECIPIENT
+        contract.encodeABI.return_value = '0xa9059cbb'
+        mock_web3.return_value = web3_instance
+        deployer = ContractDeployer("http://localhost:8545", PRIVATE_KEY)
+        deployer.sign_tx = Mock()
+        abi = [{'type': 'function', 'name': 'transfer'}]
+
+        for _ in range(2):
+            assert deployer.send_transaction(RECIPIENT, abi, 'transfer', RECIPIENT, 100) == '1234'
+
+        contract.encodeABI.assert_called_once_with(fn_name='transfer', args=[RECIPIENT, 100])
+        contract.functions.transfer.assert_not_called()
+        tx = deployer.sign_tx.call_args[0][0]
+        assert tx['to'] == RECIPIENT
+        assert tx['data'] == '0xa9059cbb'
+        assert tx['chainId'] == 1
+
+    @patch('contract_deployer.Web3')
+    def test_send_transaction_calldata_keyed_on_argument_type(self, mock_web3):
+        """Equal arguments of different types (1 and True) must be encoded separately"""
+        web3_instance = Mock()
+        web3_instance.is_connected.return_value = True
+        web3_instance.eth.send_raw_transaction.return_value = b'\x12\x34'
+        contract = web3_instance.eth.contract.return_value
+        contract.encodeABI.side_effect = lambda fn_name, args: repr(args)
+        mock_web3.return_value = web3_instance
+        deployer = ContractDeployer("http://localhost:8545", PRIVATE_KEY)
+        deployer.sign_tx = Mock()
+        abi = [{'type': 'function', 'name': 'set'}]
+
+        deployer.send_transaction(RECIPIENT, abi, 'set', 1)
+        deployer.send_transaction(RECIPIENT, abi, 'set', True)
+
+        assert contract.encodeABI.call_count == 2
+        assert deployer.sign_tx.call_args[0][0]['data'] == '[True]'
+
+    @patch('contract_deployer.time.monotonic')
+    @patch('contract_deployer.Web3')
+    def test_gas_price_cached_within_ttl(self, mock_web3, mock_monotonic):
+        """Gas price should be refetched only after the TTL expires"""
+        web3_instance = Mock()
+        web3_instance.is_connected.return_value = True
+        type(web3_instance.eth).gas_price = gas_price = PropertyMock(return_value=10)
+        mock_web3.return_value = web3_instance
+        deployer = ContractDeployer("http://localhost:8545", PRIVATE_KEY)
+
+        mock_monotonic.return_value = 100.0
+        assert deployer._cached_gas_price() == 10
+        mock_monotonic.return_value = 101.0
+        assert deployer._cached_gas_price() == 10
+        assert gas_price.call_count == 1
+
+        mock_monotonic.return_value = 100.0 + contract_deployer.GAS_PRICE_TTL
+        deployer._cached_gas_price()
+        assert gas_price.call_count == 2
+
+    @patch('contract_deployer.Web3')
+    def test_deploy_contract_poll_latency(self, mock_web3):
+        """Deployment should poll for the receipt at the configured interval"""
+        web3_instance = Mock()
+        web3_instance.is_connected.return_value = True
+        web3_instance.eth.send_raw_transaction.return_value = b'\x12\x34'
+        web3_instance.eth.wait_for_transaction_receipt.return_value = {
+            'contractAddress': '0xabc'
+        }
+        mock_web3.return_value = web3_instance
+        deployer = ContractDeployer("http://localhost:8545", PRIVATE_KEY, poll_latency=0.1)
+        deployer.sign_tx = Mock()
+
+        assert deployer.deploy_contract([], '6080') == '0xabc'
+        web3_instance.eth.wait_for_transaction_receipt.assert_called_once_with(
+            b'\x12\x34', timeout=120, poll_latency=0.1
+        )
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
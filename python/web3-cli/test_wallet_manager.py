@@ -2,10 +2,29 @@
 Unit tests for WalletManager
 """
 
+import asyncio
+import hashlib
+import json
+import logging
+import os
 import pytest
+import requests
+import wallet_manager
+from concurrent.futures import ThreadPoolExecutor
 from decimal import Decimal
-from unittest.mock import Mock, patch
-from wallet_manager import WalletManager
+from unittest.mock import AsyncMock, MagicMock, Mock, PropertyMock, patch
+from web3.providers.rpc import HTTPProvider
+from eth_account import Account
+from eth_account.messages import encode_defunct
+from eth_account.signers.local import LocalAccount
+from wallet_manager import (
+    BatchSendError, SessionAsyncHTTPProvider, SessionHTTPProvider, WalletManager,
+    _account_for, _checksum_hex, _eip191, _keccak, _keccak32,
+    format_eth, format_units, make_http_session, to_checksum_address
+)
+
+
+ADDRESS = '0x5aAeb6053F3E94C9b9A09f33669435E7Ef1BeAed'
 
 
 class TestWalletManager:
@@ -25,6 +44,21 @@ class TestWalletManager:
         assert manager.w3 is not None
         mock_web3_instance.is_connected.assert_called_once()
 
+    def test_make_http_session(self):
+        """Provider session should pool connections and retry only failed connects"""
+        session = make_http_session(pool_size=16)
+        adapter = session.get_adapter('https://rpc.example')
+
+        assert adapter is session.get_adapter('http://localhost:8545')
+        assert adapter._pool_maxsize == 16
+        retries = adapter.max_retries
+        assert retries.connect == 3
+        # A request that reached the node must never be resent
+        assert retries.read == 0
+        assert retries.status == 0
+        assert not retries.status_forcelist
+        assert not retries.is_retry('POST', 503)
+
     def test_create_wallet(self):
         """Test wallet creation"""
         with patch('wallet_manager.Web3') as mock_web3:
@@ -46,15 +80,27 @@ class TestWalletManager:
         mock_web3_instance = Mock()
         mock_web3_instance.is_connected.return_value = True
         mock_web3_instance.eth.get_balance.return_value = 1000000000000000000
-        mock_web3_instance.from_wei.return_value = '1.0'
-        mock_web3_instance.to_checksum_address.return_value = '0x123'
         mock_web3.return_value = mock_web3_instance
 
         manager = WalletManager()
-        balance = manager.get_balance('0x123')
+        balance = manager.get_balance(ADDRESS.lower())
+
+        assert balance == Decimal(1)
+        assert isinstance(balance, Decimal)
+        mock_web3_instance.eth.get_balance.assert_called_once_with(ADDRESS)
+
+    @patch('wallet_manager.Web3')
+    def test_get_balance_exact_past_28_digits(self, mock_web3):
+        """Balances beyond the default Decimal precision convert without rounding"""
+        mock_web3_instance = Mock()
+        mock_web3_instance.is_connected.return_value = True
+        mock_web3_instance.eth.get_balance.return_value = 10 ** 30 + 1
+        mock_web3.return_value = mock_web3_instance
+
+        manager = WalletManager()
+        balance = manager.get_balance(ADDRESS)
 
-        assert balance is not None
-        mock_web3_instance.eth.get_balance.assert_called_once()
+        assert balance == Decimal('1000000000000.000000000000000001')
 
     def test_sign_message(self):
         """Test message signing"""
@@ -73,6 +119,111 @@ class TestWalletManager:
             assert signature is not None
             assert isinstance(signature, str)
 
+    def test_sign_message_matches_eth_account(self):
+        """Direct libsecp256k1 signing must match eth_account's EIP-191 output"""
+        with patch('wallet_manager.Web3') as mock_web3:
+            mock_web3_instance = Mock()
+            mock_web3_instance.is_connected.return_value = True
+            mock_web3.return_value = mock_web3_instance
+
+            manager = WalletManager()
+            private_key = '0x' + '1' * 64
+            for message in ("Test message", "", "héllo wörld"):
+                expected = Account.sign_message(
+                    encode_defunct(text=message), private_key
+                ).signature.hex()
+                signature = manager.sign_message(private_key, message)
+                assert signature == expected
+                assert manager.verify_signature(
+                    message, signature, Account.from_key(private_key).address
+                )
+
+    def test_keccak_backend(self):
+        """Direct keccak helper should produce standard Keccak-256 digests"""
+        assert _keccak(b'').hex() == (
+            'c5d2460186f7233c927e7db2dcc703c0e500b653ca82273b7bfad8045d85a470'
+        )
+
+    def test_verify_signature(self):
+        """Signatures should verify with or without 0x and reject other signers"""
+        with patch('wallet_manager.Web3') as mock_web3:
+            mock_web3_instance = Mock()
+            mock_web3_instance.is_connected.return_value = True
+            mock_web3.return_value = mock_web3_instance
+
+            manager = WalletManager()
+            private_key = '0x' + '1' * 64
+            address = Account.from_key(private_key).address
+            signature = manager.sign_message(private_key, "Test message")
+
+            assert manager.verify_signature("Test message", signature[2:], address)
+            assert manager.verify_signature("Test message", bytes.fromhex(signature[2:]), address)
+            assert not manager.verify_signature("Other message", signature, address)
+            assert not manager.verify_signature("Test message", signature, ADDRESS)
+            assert manager.verify_signature("Test message", '0X' + signature[2:], address)
+            with pytest.raises(ValueError):
+                manager.verify_signature("Test message", signature[:-2], address)
+            with pytest.raises(ValueError):
+                manager.verify_signature("Test message", signature[:-1], address)
+
+    def test_ecc_backend_pinned_to_coincurve(self):
+        """Importing wallet_manager pins eth_keys to libsecp256k1 via ECC_BACKEND_CLASS"""
+        from eth_keys.backends import CoinCurveECCBackend, get_backend_class
+
+        assert os.environ['ECC_BACKEND_CLASS'] == 'eth_keys.backends.CoinCurveECCBackend'
+        assert get_backend_class() is CoinCurveECCBackend
+
+    def test_account_for_is_cached(self):
+        """Repeated lookups of one key should reuse the parsed account"""
+        private_key = '0x' + '2' * 64
+        account = _account_for(private_key)
+
+        assert _account_for(private_key) is account
+        assert account.address == Account.from_key(private_key).address
+
+    def test_key_cache_is_keyed_on_digest(self):
+        """Hex and bytes keys share an entry, and the raw key is not a cache key"""
+        raw_key = bytes.fromhex('3' * 64)
+        account = _account_for(raw_key)
+
+        assert _account_for('0x' + '3' * 64) is account
+        assert raw_key not in wallet_manager._key_cache
+        assert hashlib.blake2b(raw_key, digest_size=16).digest() in wallet_manager._key_cache
+
+    def test_eip191_envelope(self):
+        """Prefix fast path must match eth_account's encode_defunct"""
+        for body in (b'', b'hello', b'x' * 1000):
+            signable = encode_defunct(primitive=body)
+            assert _eip191(body) == b'\x19' + signable.version + signable.header + signable.body
+
+    def test_keccak32_matches_eth_hash(self):
+        """The pysha3 fast path must agree with eth_hash"""
+        for data in (b'', b'\x00' * 20, b'\xff' * 32, b'hello'):
+            assert _keccak32(data) == _keccak(data)
+
+    def test_to_checksum_address(self):
+        """Local EIP-55 implementation should match the reference vectors"""
+        for address in (
+            '0x5aAeb6053F3E94C9b9A09f33669435E7Ef1BeAed',
+            '0xfB6916095ca1df60bB79Ce92cE3Ea74c37c5d359',
+            '0xdbF03B407c01E7cD3CBea99509d93f8DDDC8C6FB',
+            '0xD1220A0cf47c7B9Be7A2E6BA89F429762e7b9aDb',
+        ):
+            assert to_checksum_address(address.lower()) == address
+            assert to_checksum_address(address[2:].upper()) == address
+        for invalid in ('0x123', '0x' + 'g' * 40):
+            with pytest.raises(ValueError):
+                to_checksum_address(invalid)
+
+    def test_checksum_cache_ignores_case(self):
+        """Mixed-case spellings of one address should share a cache entry"""
+        _checksum_hex.cache_clear()
+        for spelling in (ADDRESS, ADDRESS.lower(), ADDRESS.upper().replace('0X', '0x')):
+            assert to_checksum_address(spelling) == ADDRESS
+
+        info = _checksum_hex.cache_info()
+        assert (info.misses, info.hits) == (1, 2)
+
     @patch('wallet_manager.Web3')
     def test_estimate_dynamic_fees(self, mock_web3):
         """Fee oracle should return defensive EIP-1559 values"""
@@ -100,13 +251,45 @@ class TestWalletManager:
         assert fees['baseFeeWei'] == 1200000000
         assert fees['priorityFeeWei'] == 3000000000
         assert fees['maxFeeWei'] == 5400000000  # base * 2 + priority
+        assert fees['baseFeeGwei'] == Decimal('1.2')
+        assert fees['maxFeeGwei'] == Decimal('5.4')
+
+    def test_format_units(self):
+        """Integer formatting should be exact and trim trailing zeros"""
+        assert format_eth(10 ** 18) == '1'
+        assert format_eth(1500000000000000000) == '1.5'
+        assert format_eth(1) == '0.000000000000000001'
+        assert format_eth(0) == '0'
+        assert format_units(1200000000, 9) == '1.2'
+
+    @patch('wallet_manager.Web3')
+    def test_estimate_dynamic_fees_median_and_cache(self, mock_web3):
+        """Priority fee should use the median block and be cached briefly"""
+        web3_instance = Mock()
+        web3_instance.is_connected.return_value = True
+        web3_instance.from_wei.side_effect = lambda value, unit='ether': Decimal(value) / (
+            Decimal(10) ** (18 if unit == 'ether' else 9)
+        )
+        web3_instance.eth.fee_history.return_value = {
+            'baseFeePerGas': [1000000000, 1100000000, 1200000000, 1300000000],
+            'reward': [[9000000000], [1000000000], [2000000000]],
+        }
+        mock_web3.return_value = web3_instance
+
+        manager = WalletManager()
+        fees = manager.estimate_dynamic_fees()
+        again = manager.estimate_dynamic_fees()
+
+        assert fees['baseFeeWei'] == 1300000000
+        assert fees['priorityFeeWei'] == 2000000000
+        assert again == fees
+        web3_instance.eth.fee_history.assert_called_once_with(20, 'latest', [60])
 
     @patch('wallet_manager.Web3')
     def test_send_transaction_eip1559(self, mock_web3):
         """Send transaction should support dynamic EIP-1559 fields"""
         web3_instance = Mock()
         web3_instance.is_connected.return_value = True
-        web3_instance.to_checksum_address.return_value = '0xabc'
         web3_instance.to_wei.side_effect = lambda value, unit='ether': int(
             value * (10 ** 18 if unit == 'ether' else 10 ** 9)
         )
@@ -123,10 +306,6 @@ class TestWalletManager:
             'baseFeePerGas': [1000000000, 1500000000],
             'reward': [[2000000000], [2500000000]],
         }
-        sign_result = Mock()
-        sign_result.rawTransaction = b'raw_tx'
-        eth.account = Mock()
-        eth.account.sign_transaction.return_value = sign_result
         eth.send_raw_transaction.return_value = b'\x12\x34'
         web3_instance.eth = eth
         mock_web3.return_value = web3_instance
@@ -134,14 +313,573 @@ class TestWalletManager:
         manager = WalletManager()
         tx_hash = manager.send_transaction(
             private_key='0x' + '1' * 64,
-            to_address='0xdef',
+            to_address=ADDRESS,
             amount_eth=0.01,
             use_eip1559=True,
         )
 
-        eth.account.sign_transaction.assert_called_once()
+        # Signed locally as a type-2 (EIP-1559) transaction
+        raw_tx = eth.send_raw_transaction.call_args[0][0]
+        assert raw_tx[:1] == b'\x02'
         assert tx_hash == '1234'
 
+        raw_hash = manager.send_transaction_raw(
+            private_key='0x' + '1' * 64,
+            to_address=ADDRESS,
+            amount_eth=0.01,
+            use_eip1559=True,
+        )
+        assert raw_hash == b'\x12\x34'
+
+    @patch('wallet_manager.SessionHTTPProvider')
+    @patch('wallet_manager.make_http_session')
+    @patch('wallet_manager.Web3')
+    def test_initialization_pool_size(self, mock_web3, mock_session, mock_provider):
+        """Constructor pool_size should size the provider's session"""
+        mock_web3.return_value.is_connected.return_value = True
+
+        WalletManager("http://localhost:8545", pool_size=4)
+
+        mock_session.assert_called_once_with(4)
+        assert mock_provider.call_args[0] == ("http://localhost:8545", mock_session.return_value)
+
+    def test_session_provider_shares_session_across_threads(self):
+        """Requests from any thread should go through the provider's own session"""
+        session = Mock()
+        session.post.return_value.content = b'{"jsonrpc": "2.0", "id": 0, "result": "0x1"}'
+        provider = SessionHTTPProvider("http://localhost:8545", session)
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            responses = list(pool.map(
+                lambda _: provider.make_request('eth_chainId', []), range(2)
+            ))
+
+        assert [response['result'] for response in responses] == ['0x1', '0x1']
+        assert session.post.call_count == 2
+        assert session.post.call_args.kwargs['timeout'] == 30
+
+    def test_batch_request_uses_provider_session(self):
+        """Batches should post through the provider's session too"""
+        session = Mock()
+        session.post.return_value.content = json.dumps([
+            {'jsonrpc': '2.0', 'id': 0, 'result': '0x1'},
+        ]).encode()
+        with patch('wallet_manager.Web3') as mock_web3:
+            mock_web3.return_value.is_connected.return_value = True
+            manager = WalletManager()
+        manager.w3.provider = SessionHTTPProvider("http://localhost:8545", session)
+
+        assert manager._batch_request([('eth_chainId', [])]) == ['0x1']
+        session.post.assert_called_once()
+
+    @patch('wallet_manager.make_post_request')
+    @patch('wallet_manager.Web3')
+    def test_initialization_batches_rpc_calls(self, mock_web3, mock_post, caplog):
+        """With INFO logging, chain ID and block number are fetched in one HTTP request"""
+        caplog.set_level(logging.INFO, logger='wallet_manager')
+        web3_instance = Mock()
+        web3_instance.is_connected.return_value = True
+        web3_instance.provider = HTTPProvider("http://localhost:8545")
+        mock_web3.return_value = web3_instance
+        mock_post.return_value = json.dumps([
+            {'jsonrpc': '2.0', 'id': 1, 'result': '0x3039'},
+            {'jsonrpc': '2.0', 'id': 0, 'result': '0xaa36a7'},
+        ]).encode()
+
+        manager = WalletManager("http://localhost:8545")
+
+        assert manager._chain_id == 11155111
+        mock_post.assert_called_once()
+        payload = json.loads(mock_post.call_args[0][1])
+        assert [call['method'] for call in payload] == ['eth_chainId', 'eth_blockNumber']
+        assert 'Latest block: 12345' in caplog.text
+
+    @patch('wallet_manager.make_post_request')
+    @patch('wallet_manager.Web3')
+    def test_initialization_skips_display_reads(self, mock_web3, mock_post):
+        """Without INFO logging, the chain is not read until the chain ID is needed"""
+        web3_instance = Mock()
+        web3_instance.is_connected.return_value = True
+        web3_instance.provider = HTTPProvider("http://localhost:8545")
+        type(web3_instance.eth).chain_id = chain_id = PropertyMock(return_value=5)
+        mock_web3.return_value = web3_instance
+
+        manager = WalletManager("http://localhost:8545")
+
+        mock_post.assert_not_called()
+        chain_id.assert_not_called()
+        assert manager.chain_id == 5
+        assert manager.chain_id == 5
+        chain_id.assert_called_once()
+
+    @patch('wallet_manager.Web3')
+    def test_call_contract_function_reuses_contract(self, mock_web3):
+        """Repeated calls against one contract should build it only once"""
+        web3_instance = Mock()
+        web3_instance.is_connected.return_value = True
+        web3_instance.eth.contract.return_value.functions.balanceOf.return_value.call.return_value = 7
+        mock_web3.return_value = web3_instance
+        abi = [{'type': 'function', 'name': 'balanceOf'}]
+
+        manager = WalletManager()
+        for _ in range(3):
+            assert manager.call_contract_function(ADDRESS.lower(), abi, 'balanceOf', ADDRESS) == 7
+
+        web3_instance.eth.contract.assert_called_once_with(address=ADDRESS, abi=abi)
+
+        # An equal ABI loaded separately (e.g. re-read from JSON) reuses the contract
+        manager.call_contract_function(ADDRESS, json.loads(json.dumps(abi)), 'balanceOf', ADDRESS)
+        web3_instance.eth.contract.assert_called_once()
+
+    @patch('wallet_manager.make_post_request')
+    @patch('wallet_manager.Web3')
+    def test_get_balances_batch(self, mock_web3, mock_post):
+        """Balances of many addresses should be fetched in one HTTP request"""
+        web3_instance = Mock()
+        web3_instance.is_connected.return_value = True
+        web3_instance.provider = HTTPProvider("http://localhost:8545")
+        mock_web3.return_value = web3_instance
+        mock_post.return_value = json.dumps([
+            {'jsonrpc': '2.0', 'id': 1, 'result': '0x1bc16d674ec80000'},
+            {'jsonrpc': '2.0', 'id': 0, 'result': '0xde0b6b3a7640000'},
+        ]).encode()
+
+        manager = WalletManager("http://localhost:8545")
+        balances = manager.get_balances_batch([ADDRESS.lower(), ADDRESS])
+
+        assert balances == [Decimal(1), Decimal(2)]
+        mock_post.assert_called_once()
+        payload = json.loads(mock_post.call_args[0][1])
+        assert [call['params'] for call in payload] == [[ADDRESS, 'latest']] * 2
+        web3_instance.eth.get_balance.assert_not_called()
+
+    @patch('wallet_manager.make_post_request')
+    @patch('wallet_manager.Web3')
+    def test_batch_request_falls_back_when_batches_refused(self, mock_web3, mock_post):
+        """HTTP 4xx, per-entry batch errors and single error bodies fall back to single calls"""
+        web3_instance = Mock()
+        web3_instance.is_connected.return_value = True
+        web3_instance.provider = HTTPProvider("http://localhost:8545")
+        web3_instance.eth.get_balance.return_value = 10 ** 18
+        mock_web3.return_value = web3_instance
+        manager = WalletManager("http://localhost:8545")
+
+        def error(code, message):
+            return {'code': code, 'message': message}
+
+        refusals = [
+            requests.HTTPError(response=Mock(status_code=405)),
+            json.dumps([
+                {'jsonrpc': '2.0', 'id': 0, 'error': error(-32600, 'invalid request')},
+            ]).encode(),
+            json.dumps([
+                {'jsonrpc': '2.0', 'id': 0, 'error': error(-32000, 'Batch not supported')},
+            ]).encode(),
+            json.dumps({'jsonrpc': '2.0', 'id': None, 'error': error(-32700, 'parse')}).encode(),
+        ]
+        for refusal in refusals:
+            mock_post.side_effect = [refusal]
+            assert manager.get_balances_batch([ADDRESS]) == [Decimal(1)]
+
+        assert web3_instance.eth.get_balance.call_count == len(refusals)
+
+    @patch('wallet_manager.make_post_request')
+    @patch('wallet_manager.Web3')
+    def test_batch_request_falls_back_on_short_reply(self, mock_web3, mock_post):
+        """Replies missing an entry or carrying unknown ids fall back to single calls"""
+        web3_instance = Mock()
+        web3_instance.is_connected.return_value = True
+        web3_instance.provider = HTTPProvider("http://localhost:8545")
+        web3_instance.eth.get_balance.return_value = 10 ** 18
+        mock_web3.return_value = web3_instance
+        manager = WalletManager("http://localhost:8545")
+
+        for reply in (
+            [{'jsonrpc': '2.0', 'id': 0, 'result': '0x0'}],
+            [{'jsonrpc': '2.0', 'id': 0, 'result': '0x0'}, {'jsonrpc': '2.0', 'id': 5, 'result': '0x0'}],
+        ):
+            mock_post.return_value = json.dumps(reply).encode()
+            assert manager.get_balances_batch([ADDRESS, ADDRESS]) == [Decimal(1)] * 2
+
+        assert web3_instance.eth.get_balance.call_count == 4
+
+    @patch('wallet_manager.make_post_request')
+    @patch('wallet_manager.Web3')
+    def test_batch_request_raises_other_errors(self, mock_web3, mock_post):
+        """Server errors and ordinary per-entry errors are not mistaken for refusals"""
+        web3_instance = Mock()
+        web3_instance.is_connected.return_value = True
+        web3_instance.provider = HTTPProvider("http://localhost:8545")
+        mock_web3.return_value = web3_instance
+        manager = WalletManager("http://localhost:8545")
+
+        mock_post.side_effect = requests.HTTPError(response=Mock(status_code=502))
+        with pytest.raises(requests.HTTPError):
+            manager.get_balances_batch([ADDRESS])
+
+        mock_post.side_effect = None
+        mock_post.return_value = json.dumps([
+            {'jsonrpc': '2.0', 'id': 0, 'error': {'code': -32602, 'message': 'invalid argument'}},
+        ]).encode()
+        with pytest.raises(ValueError):
+            manager.get_balances_batch([ADDRESS])
+        web3_instance.eth.get_balance.assert_not_called()
+
+    @patch('wallet_manager.Web3')
+    def test_get_balances_batch_fallback(self, mock_web3):
+        """Providers that can't batch should get one request per address"""
+        web3_instance = Mock()
+        web3_instance.is_connected.return_value = True
+        web3_instance.eth.get_balance.side_effect = [10 ** 18, 0]
+        mock_web3.return_value = web3_instance
+
+        manager = WalletManager()
+
+        assert manager.get_balances_batch([ADDRESS, ADDRESS]) == [Decimal(1), Decimal(0)]
+        assert web3_instance.eth.get_balance.call_count == 2
+
+    @patch('wallet_manager.logger')
+    @patch('wallet_manager.WalletManager')
+    def test_cli_balances_formatted_from_wei(self, mock_manager, mock_logger, capsys):
+        """The multi-address balance command prints plain decimals, not exponents"""
+        mock_manager.return_value.get_balances_batch_wei.return_value = [1, 10 ** 18]
+
+        with patch('sys.argv', ['wallet_manager.py', 'balance', ADDRESS, ADDRESS]):
+            wallet_manager.main()
+
+        out = capsys.readouterr().out
+        assert f"{ADDRESS}: 0.000000000000000001 ETH" in out
+        assert f"{ADDRESS}: 1 ETH" in out
+
+    @patch('wallet_manager.aiohttp')
+    @patch('wallet_manager.SessionAsyncHTTPProvider')
+    @patch('wallet_manager.AsyncWeb3')
+    @patch('wallet_manager.Web3')
+    def test_get_balances_async(self, mock_web3, mock_async_web3, mock_provider, mock_aiohttp):
+        """Async mode should fetch balances concurrently and close its session afterwards"""
+        web3_instance = Mock()
+        web3_instance.is_connected.return_value = True
+        mock_web3.return_value = web3_instance
+        async_instance = Mock()
+        async_instance.provider.session = None
+        async_instance.eth.get_balance = AsyncMock(side_effect=[10 ** 18, 2 * 10 ** 18, 0])
+        mock_async_web3.return_value = async_instance
+        sessions = [Mock(close=AsyncMock()), Mock(close=AsyncMock())]
+        mock_aiohttp.ClientSession.side_effect = sessions
+
+        manager = WalletManager(async_mode=True)
+        balances = asyncio.run(manager.get_balances([ADDRESS, ADDRESS.lower()]))
+        # A second event loop gets a fresh session rather than a stale one
+        assert asyncio.run(manager.get_balances([ADDRESS])) == [Decimal(0)]
+
+        assert balances == [Decimal(1), Decimal(2)]
+        assert async_instance.eth.get_balance.await_count == 3
+        for session in sessions:
+            session.close.assert_awaited_once()
+        assert async_instance.provider.session is None
+
+    def test_session_async_provider_posts_through_session(self):
+        """The async provider should use the session it was given"""
+        response = Mock()
+        response.read = AsyncMock(return_value=b'{"jsonrpc": "2.0", "id": 0, "result": "0x1"}')
+        request = MagicMock()
+        request.__aenter__.return_value = response
+        session = Mock()
+        session.post.return_value = request
+        provider = SessionAsyncHTTPProvider("http://localhost:8545")
+
+        provider.session = session
+        result = asyncio.run(provider.make_request('eth_chainId', []))
+
+        assert result['result'] == '0x1'
+        assert session.post.call_args[0][0] == "http://localhost:8545"
+        response.raise_for_status.assert_called_once()
+
+    @patch('wallet_manager.aiohttp.ClientSession')
+    def test_session_async_provider_without_batch(self, mock_session):
+        """Requests outside a batch open and close a session of their own"""
+        response = Mock()
+        response.read = AsyncMock(return_value=b'{"jsonrpc": "2.0", "id": 0, "result": "0x1"}')
+        request = MagicMock()
+        request.__aenter__.return_value = response
+        session = MagicMock()
+        session.post.return_value = request
+        mock_session.return_value.__aenter__.return_value = session
+        provider = SessionAsyncHTTPProvider("http://localhost:8545")
+
+        result = asyncio.run(provider.make_request('eth_chainId', []))
+
+        assert result['result'] == '0x1'
+        session.post.assert_called_once()
+        mock_session.return_value.__aexit__.assert_awaited_once()
+        assert provider.session is None
+
+    @patch('wallet_manager.Web3')
+    def test_get_balances_requires_async_mode(self, mock_web3):
+        """Concurrent reads should fail clearly without async_mode"""
+        web3_instance = Mock()
+        web3_instance.is_connected.return_value = True
+        mock_web3.return_value = web3_instance
+
+        manager = WalletManager()
+        with pytest.raises(RuntimeError):
+            asyncio.run(manager.get_balances([ADDRESS]))
+
+    @patch.object(LocalAccount, 'sign_transaction', autospec=True)
+    @patch('wallet_manager.Web3')
+    def test_send_transaction_skips_gas_estimate(self, mock_web3, mock_sign):
+        """Transfers to accounts without code should not call estimate_gas"""
+        web3_instance = Mock()
+        web3_instance.is_connected.return_value = True
+        web3_instance.to_wei.side_effect = lambda value, unit='ether': int(
+            value * (10 ** 18 if unit == 'ether' else 10 ** 9)
+        )
+        eth = Mock()
+        eth.chain_id = 1
+        eth.block_number = 123
+        eth.get_transaction_count.return_value = 0
+        eth.get_code.return_value = b''
+        eth.send_raw_transaction.return_value = b'\x12\x34'
+        web3_instance.eth = eth
+        mock_web3.return_value = web3_instance
+
+        manager = WalletManager()
+        for _ in range(2):
+            manager.send_transaction('0x' + '1' * 64, ADDRESS, 0.01)
+
+        eth.estimate_gas.assert_not_called()
+        eth.get_code.assert_called_once_with(ADDRESS)
+        tx = mock_sign.call_args[0][1]
+        assert tx['gas'] == 21000
+
+    @patch.object(LocalAccount, 'sign_transaction', autospec=True)
+    @patch('wallet_manager.Web3')
+    def test_send_transaction_caches_contract_gas(self, mock_web3, mock_sign):
+        """Transfers to contracts estimate gas once and reuse it"""
+        web3_instance = Mock()
+        web3_instance.is_connected.return_value = True
+        web3_instance.to_wei.side_effect = lambda value, unit='ether': int(
+            value * (10 ** 18 if unit == 'ether' else 10 ** 9)
+        )
+        eth = Mock()
+        eth.chain_id = 1
+        eth.block_number = 123
+        eth.get_transaction_count.return_value = 0
+        eth.get_code.return_value = b'\x60\x80'
+        eth.estimate_gas.return_value = 30000
+        eth.send_raw_transaction.return_value = b'\x12\x34'
+        web3_instance.eth = eth
+        mock_web3.return_value = web3_instance
+
+        manager = WalletManager()
+        for _ in range(2):
+            manager.send_transaction('0x' + '1' * 64, ADDRESS, 0.01)
+
+        eth.estimate_gas.assert_called_once()
+        tx = mock_sign.call_args[0][1]
+        assert tx['gas'] == 30000
+
+    @patch('wallet_manager.time.monotonic')
+    @patch.object(LocalAccount, 'sign_transaction', autospec=True)
+    @patch('wallet_manager.Web3')
+    def test_send_transaction_gas_cache_expires(self, mock_web3, mock_sign, mock_monotonic):
+        """Cached gas expires, so a recipient that gains code is re-checked"""
+        web3_instance = Mock()
+        web3_instance.is_connected.return_value = True
+        web3_instance.to_wei.side_effect = lambda value, unit='ether': int(
+            value * (10 ** 18 if unit == 'ether' else 10 ** 9)
+        )
+        eth = Mock()
+        eth.chain_id = 1
+        eth.get_transaction_count.return_value = 0
+        eth.get_code.side_effect = [b'', b'\xef\x01\x00']
+        eth.estimate_gas.return_value = 30000
+        eth.send_raw_transaction.return_value = b'\x12\x34'
+        web3_instance.eth = eth
+        mock_web3.return_value = web3_instance
+
+        manager = WalletManager()
+        mock_monotonic.return_value = 100.0
+        manager.send_transaction('0x' + '1' * 64, ADDRESS, 0.01)
+        assert mock_sign.call_args[0][1]['gas'] == 21000
+
+        mock_monotonic.return_value = 100.0 + wallet_manager.GAS_CACHE_TTL
+        manager.send_transaction('0x' + '1' * 64, ADDRESS, 0.01)
+
+        assert eth.get_code.call_count == 2
+        assert mock_sign.call_args[0][1]['gas'] == 30000
+
+    @patch.object(LocalAccount, 'sign_transaction', autospec=True)
+    @patch('wallet_manager.Web3')
+    def test_send_transaction_contract_gas_keyed_on_value(self, mock_web3, mock_sign):
+        """Contract estimates are not reused across different values"""
+        web3_instance = Mock()
+        web3_instance.is_connected.return_value = True
+        web3_instance.to_wei.side_effect = lambda value, unit='ether': int(
+            value * (10 ** 18 if unit == 'ether' else 10 ** 9)
+        )
+        eth = Mock()
+        eth.chain_id = 1
+        eth.get_transaction_count.return_value = 0
+        eth.get_code.return_value = b'\x60\x80'
+        eth.estimate_gas.side_effect = [30000, 45000]
+        eth.send_raw_transaction.return_value = b'\x12\x34'
+        web3_instance.eth = eth
+        mock_web3.return_value = web3_instance
+
+        manager = WalletManager()
+        manager.send_transaction('0x' + '1' * 64, ADDRESS, 0.01)
+        manager.send_transaction('0x' + '1' * 64, ADDRESS, 0.02)
+
+        assert eth.estimate_gas.call_count == 2
+        assert mock_sign.call_args[0][1]['gas'] == 45000
+
+    @patch.object(LocalAccount, 'sign_transaction', autospec=True)
+    @patch('wallet_manager.Web3')
+    def test_send_transaction_reuses_chain_id(self, mock_web3, mock_sign):
+        """Sends should sign with the cached account and chain id"""
+        web3_instance = Mock()
+        web3_instance.is_connected.return_value = True
+        web3_instance.to_wei.side_effect = lambda value, unit='ether': int(
+            value * (10 ** 18 if unit == 'ether' else 10 ** 9)
+        )
+        eth = Mock()
+        type(eth).chain_id = chain_id = PropertyMock(return_value=5)
+        eth.block_number = 123
+        eth.get_transaction_count.return_value = 0
+        eth.get_code.return_value = b''
+        eth.send_raw_transaction.return_value = b'\x12\x34'
+        web3_instance.eth = eth
+        mock_web3.return_value = web3_instance
+
+        manager = WalletManager()
+        for _ in range(2):
+            manager.send_transaction('0x' + '1' * 64, ADDRESS, 0.01)
+
+        chain_id.assert_called_once()
+        account, tx = mock_sign.call_args[0]
+        assert account is _account_for('0x' + '1' * 64)
+        assert tx['chainId'] == 5
+        web3_instance.eth.account.sign_transaction.assert_not_called()
+
+    @patch('wallet_manager.make_post_request')
+    @patch('wallet_manager.Web3')
+    def test_send_transactions_batch(self, mock_web3, mock_post):
+        """Batch sends should fetch the nonce once and submit in one request"""
+        web3_instance = Mock()
+        web3_instance.is_connected.return_value = True
+        web3_instance.provider = HTTPProvider("http://localhost:8545")
+        web3_instance.eth.chain_id = 1
+        web3_instance.eth.get_transaction_count.return_value = 7
+        mock_web3.return_value = web3_instance
+        mock_post.return_value = json.dumps([
+            {'jsonrpc': '2.0', 'id': 1, 'result': '0x' + 'bb' * 32},
+            {'jsonrpc': '2.0', 'id': 0, 'result': '0x' + 'aa' * 32},
+        ]).encode()
+        private_key = '0x' + '1' * 64
+        tx = {'to': ADDRESS.lower(), 'value': 1, 'gas': 21000, 'gasPrice': 10 ** 9}
+
+        manager = WalletManager("http://localhost:8545")
+        tx_hashes = manager.send_transactions_batch(private_key, [tx, tx])
+
+        assert tx_hashes == ['0x' + 'aa' * 32, '0x' + 'bb' * 32]
+        web3_instance.eth.get_transaction_count.assert_called_once_with(
+            _account_for(private_key).address, 'pending'
+        )
+        payload = json.loads(mock_post.call_args[0][1])
+        assert [call['method'] for call in payload] == ['eth_sendRawTransaction'] * 2
+        # Consecutive nonces from the single pending-count read
+        expected_raw_txs = [
+            '0x' + bytes(Account.sign_transaction(
+                {**tx, 'to': ADDRESS, 'chainId': 1, 'nonce': nonce}, private_key
+            ).rawTransaction).hex()
+            for nonce in (7, 8)
+        ]
+        assert [call['params'][0] for call in payload] == expected_raw_txs
+        web3_instance.eth.send_raw_transaction.assert_not_called()
+
+    @patch('wallet_manager.make_post_request')
+    @patch('wallet_manager.Web3')
+    def test_send_transactions_batch_partial_failure(self, mock_web3, mock_post):
+        """A partly rejected batch should report which transactions were accepted"""
+        web3_instance = Mock()
+        web3_instance.is_connected.return_value = True
+        web3_instance.provider = HTTPProvider("http://localhost:8545")
+        web3_instance.eth.chain_id = 1
+        web3_instance.eth.get_transaction_count.return_value = 7
+        mock_web3.return_value = web3_instance
+        mock_post.return_value = json.dumps([
+            {'jsonrpc': '2.0', 'id': 0, 'result': '0x' + 'aa' * 32},
+            {'jsonrpc': '2.0', 'id': 1, 'error': {'code': -32000, 'message': 'insufficient funds'}},
+            {'jsonrpc': '2.0', 'id': 2, 'result': '0x' + 'cc' * 32},
+        ]).encode()
+        tx = {'to': ADDRESS, 'value': 1, 'gas': 21000, 'gasPrice': 10 ** 9}
+
+        manager = WalletManager("http://localhost:8545")
+        with pytest.raises(BatchSendError) as excinfo:
+            manager.send_transactions_batch('0x' + '1' * 64, [tx, tx, tx])
+
+        error = excinfo.value
+        assert isinstance(error, ValueError)
+        assert error.tx_hashes == ['0x' + 'aa' * 32, None, '0x' + 'cc' * 32]
+        assert error.errors == {1: {'code': -32000, 'message': 'insufficient funds'}}
+        assert error.base_nonce == 7
+        web3_instance.eth.send_raw_transaction.assert_not_called()
+
+    @patch('wallet_manager.make_post_request')
+    @patch('wallet_manager.Web3')
+    def test_send_transactions_batch_short_reply(self, mock_web3, mock_post):
+        """Transactions missing from the reply are reported, never resent"""
+        web3_instance = Mock()
+        web3_instance.is_connected.return_value = True
+        web3_instance.provider = HTTPProvider("http://localhost:8545")
+        web3_instance.eth.chain_id = 1
+        web3_instance.eth.get_transaction_count.return_value = 0
+        mock_web3.return_value = web3_instance
+        mock_post.return_value = json.dumps([
+            {'jsonrpc': '2.0', 'id': 0, 'result': '0x' + 'aa' * 32},
+        ]).encode()
+        tx = {'to': ADDRESS, 'value': 1, 'gas': 21000, 'gasPrice': 10 ** 9}
+
+        manager = WalletManager("http://localhost:8545")
+        with pytest.raises(BatchSendError) as excinfo:
+            manager.send_transactions_batch('0x' + '1' * 64, [tx, tx])
+
+        assert excinfo.value.tx_hashes == ['0x' + 'aa' * 32, None]
+        assert excinfo.value.errors == {1: 'no response'}
+        web3_instance.eth.send_raw_transaction.assert_not_called()
+
+    @patch('wallet_manager.make_post_request')
+    @patch('wallet_manager.Web3')
+    def test_send_transactions_batch_refused(self, mock_web3, mock_post):
+        """Entries refused as a batch are sent one by one; accepted ones are not resent"""
+        web3_instance = Mock()
+        web3_instance.is_connected.return_value = True
+        web3_instance.provider = HTTPProvider("http://localhost:8545")
+        web3_instance.eth.chain_id = 1
+        web3_instance.eth.get_transaction_count.return_value = 0
+        web3_instance.eth.send_raw_transaction.return_value.hex.return_value = '0x' + 'bb' * 32
+        mock_web3.return_value = web3_instance
+        mock_post.return_value = json.dumps([
+            {'jsonrpc': '2.0', 'id': 0, 'result': '0x' + 'aa' * 32},
+            {
+                'jsonrpc': '2.0', 'id': 1,
+                'error': {'code': -32000, 'message': 'batch limit exceeded'},
+            },
+        ]).encode()
+        tx = {'to': ADDRESS, 'value': 1, 'gas': 21000, 'gasPrice': 10 ** 9}
+
+        manager = WalletManager("http://localhost:8545")
+        tx_hashes = manager.send_transactions_batch('0x' + '1' * 64, [tx, tx])
+
+        assert tx_hashes == ['0x' + 'aa' * 32, '0x' + 'bb' * 32]
+        web3_instance.eth.send_raw_transaction.assert_called_once()
+
+        mock_post.side_effect = requests.HTTPError(response=Mock(status_code=400))
+        web3_instance.eth.send_raw_transaction.reset_mock()
+        manager.send_transactions_batch('0x' + '1' * 64, [tx, tx])
+        assert web3_instance.eth.send_raw_transaction.call_count == 2
+
 
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
@@ -4,30 +4,457 @@ Web3 Wallet Manager - CLI tool for Ethereum wallet operations
 Demonstrates Web3.py usage for blockchain interactions
 """
 
+import asyncio
+import binascii
+import contextlib
+import functools
+import hashlib
+import json
+import logging
 import sys
-from decimal import Decimal
+import threading
+import time
+from decimal import Decimal, localcontext
 import os
-from web3 import Web3
+
+# Prefer the pysha3 C backend for eth-hash when available; this must be set
+# before web3/eth_account import eth_hash and pick a backend
+try:
+    import sha3
+    os.environ.setdefault('ETH_HASH_BACKEND', 'pysha3')
+except ImportError:
+    sha3 = None
+# Run eth_keys (used by eth_account) on libsecp256k1 rather than pure Python
+os.environ.setdefault('ECC_BACKEND_CLASS', 'eth_keys.backends.CoinCurveECCBackend')
+
+import aiohttp
+import coincurve
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from eth_hash.auto import keccak as _keccak
+from web3 import AsyncHTTPProvider, AsyncWeb3, Web3
+from web3._utils.request import make_post_request
+from web3.providers.rpc import HTTPProvider
 from eth_account import Account
-from eth_account.messages import encode_defunct
+from eth_account.signers.local import LocalAccount
+
+logger = logging.getLogger(__name__)
+
+# Fee oracle defaults: sample this many blocks at this reward percentile
+FEE_HISTORY_BLOCKS = 20
+FEE_PERCENTILE = 60
+# Fee suggestions are reused for roughly one block time
+FEE_CACHE_TTL = 6.0
+# Recipients can gain code (EIP-7702 delegation, CREATE2 deploy) and contract
+# state drifts, so cached gas limits are re-derived after this many seconds
+GAS_CACHE_TTL = 60.0
+
+GWEI = Decimal(10 ** 9)
+ETHER = Decimal(10 ** 18)
+
+_EIP191_PREFIX = b"\x19Ethereum Signed Message:\n"
+
+# Seconds before an HTTP JSON-RPC request is abandoned
+HTTP_TIMEOUT = 30
+
+if sha3 is not None:
+    def _keccak32(data: bytes) -> bytes:
+        """One-shot Keccak-256 straight from pysha3, skipping eth_hash dispatch"""
+        return sha3.keccak_256(data).digest()
+else:
+    _keccak32 = _keccak
+
+
+def _strip0x(value: str) -> str:
+    """Drop a leading 0x from a hex string"""
+    return value[2:] if value[:2] in ('0x', '0X') else value
+
+
+@functools.lru_cache(maxsize=1024)
+def _checksum_hex(hex_address: str) -> str:
+    """Checksum a lowercase, unprefixed hex address; memoized for hot loops"""
+    if len(hex_address) != 40:
+        raise ValueError(f"Unknown format {hex_address!r}, attempted to normalize to a hex address")
+    binascii.unhexlify(hex_address)  # raises ValueError on non-hex characters
+    # Comparing hex digits is cheaper in CPython than shifting nibbles out of the digest
+    address_hash = _keccak32(hex_address.encode()).hex()
+    return '0x' + ''.join(
+        char.upper() if nibble in '89abcdef' else char
+        for char, nibble in zip(hex_address, address_hash)
+    )
+
+
+def to_checksum_address(address: str) -> str:
+    """
+    EIP-55 checksum an address with a single direct keccak
+
+    Args:
+        address: 20-byte hex address, with or without 0x, in any case
+
+    Returns:
+        Checksummed 0x-prefixed address
+    """
+    # Normalize before the cache so differently-cased inputs share one entry
+    return _checksum_hex(_strip0x(address).lower())
+
+
+_checksum = to_checksum_address
+
+
+def format_units(wei: int, decimals: int = 18) -> str:
+    """
+    Format an integer wei amount using integer arithmetic only
+
+    Args:
+        wei: Amount in wei
+        decimals: Decimal places of the target unit (18 for ETH, 9 for Gwei)
+
+    Returns:
+        Decimal string without trailing zeros, e.g. "1.5"
+    """
+    whole, fraction = divmod(wei, 10 ** decimals)
+    return f"{whole}.{fraction:0{decimals}d}".rstrip('0').rstrip('.')
+
+
+def format_eth(wei: int) -> str:
+    """Format a wei amount as ETH"""
+    return format_units(wei, 18)
+
+
+def _from_wei(wei: int, unit: Decimal = ETHER) -> Decimal:
+    """Exact Decimal value of a wei amount in a larger unit, past the default 28-digit precision"""
+    with localcontext() as ctx:
+        ctx.prec = 999
+        return Decimal(wei) / unit
+
+
+def make_http_session(pool_size: int = 32) -> requests.Session:
+    """
+    Build a keep-alive HTTP session for JSON-RPC providers
+
+    Args:
+        pool_size: Maximum pooled connections per host, shared by all threads
+
+    Returns:
+        Session that reuses TCP/TLS connections and retries failed connects
+    """
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        # Only retry when the request never reached the node: resending after
+        # a 5xx or read timeout could rebroadcast an eth_sendRawTransaction
+        # that already landed
+        max_retries=Retry(
+            total=3,
+            connect=3,
+            read=0,
+            status=0,
+            other=0,
+            backoff_factor=0.1,
+            allowed_methods=frozenset({'POST'}),
+        ),
+    )
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+class SessionHTTPProvider(HTTPProvider):
+    """
+    HTTPProvider that posts every request through its own session
+
+    web3 caches sessions per (thread, URL), so a session handed to the stock
+    HTTPProvider only serves the constructing thread, and only if no other
+    provider for that URL got there first.
+    """
+
+    def __init__(
+        self,
+        endpoint_uri: str,
+        session: requests.Session,
+        request_kwargs: dict | None = None
+    ):
+        super().__init__(endpoint_uri, request_kwargs=request_kwargs)
+        self._session = session
+
+    def post(self, data: bytes) -> bytes:
+        """POST a raw JSON-RPC payload and return the raw response body"""
+        kwargs = self.get_request_kwargs()
+        kwargs.setdefault('timeout', HTTP_TIMEOUT)
+        response = self._session.post(self.endpoint_uri, data=data, **kwargs)
+        response.raise_for_status()
+        return response.content
+
+    def make_request(self, method, params):
+        self.logger.debug("Making request HTTP. URI: %s, Method: %s", self.endpoint_uri, method)
+        return self.decode_rpc_response(self.post(self.encode_rpc_request(method, params)))
+
+
+class SessionAsyncHTTPProvider(AsyncHTTPProvider):
+    """
+    AsyncHTTPProvider that posts every request through the session it is given
+
+    web3's async session cache is keyed by thread and, once its cached session
+    belongs to a closed loop, replaces it with a default session of its own;
+    here the owner opens and closes the session around each batch of reads.
+    Requests made outside a batch get a short-lived session of their own.
+    """
+
+    session: aiohttp.ClientSession | None = None
+
+    async def make_request(self, method, params):
+        self.logger.debug("Making request HTTP. URI: %s, Method: %s", self.endpoint_uri, method)
+        if self.session is None:
+            async with aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT)
+            ) as session:
+                return await self._post(session, method, params)
+        return await self._post(self.session, method, params)
+
+    async def _post(self, session: aiohttp.ClientSession, method, params):
+        async with session.post(
+            self.endpoint_uri,
+            data=self.encode_rpc_request(method, params),
+            **self.get_request_kwargs()
+        ) as response:
+            response.raise_for_status()
+            return self.decode_rpc_response(await response.read())
+
+
+def _eip191(message: bytes) -> bytes:
+    """Wrap a message in the EIP-191 personal message envelope"""
+    return _EIP191_PREFIX + b"%d" % len(message) + message
+
+
+def _eip191_digest(message: str) -> bytes:
+    """Keccak digest of an EIP-191 personal message (same format as MetaMask)"""
+    return _keccak32(_eip191(message.encode()))
+
+
+# ABI content digests indexed by id(abi); see abi_digest
+ABI_CACHE_SIZE = 128
+_abi_digests = {}
+_abi_digests_lock = threading.Lock()
+
+
+def abi_digest(abi: list) -> bytes:
+    """
+    Digest of an ABI's content, so equal ABIs loaded separately share cache entries
+
+    The JSON serialization is memoized per ABI object; each entry keeps its
+    ABI alive, so an id() can't be reused while it is cached.
+    """
+    cached = _abi_digests.get(id(abi))
+    if cached is None:
+        digest = hashlib.blake2b(
+            json.dumps(abi, sort_keys=True).encode(), digest_size=16
+        ).digest()
+        with _abi_digests_lock:
+            if len(_abi_digests) >= ABI_CACHE_SIZE:
+                del _abi_digests[next(iter(_abi_digests))]
+            cached = _abi_digests[id(abi)] = (abi, digest)
+    return cached[1]
+
+
+# Parsed keys indexed by a digest of the private key, so the raw key is never
+# held as a cache key; see _keys_for
+KEY_CACHE_SIZE = 64
+_key_cache = {}
+# Serializes eviction so concurrent misses don't both delete the oldest key
+_key_cache_lock = threading.Lock()
+
+
+def _keys_for(private_key: str | bytes) -> tuple[LocalAccount, coincurve.PrivateKey]:
+    """Parse a private key once; deriving its address costs an EC multiplication"""
+    if isinstance(private_key, str):
+        private_key = binascii.unhexlify(_strip0x(private_key))
+    digest = hashlib.blake2b(private_key, digest_size=16).digest()
+    keys = _key_cache.get(digest)
+    if keys is None:
+        keys = (Account.from_key(private_key), coincurve.PrivateKey(private_key))
+        with _key_cache_lock:
+            if len(_key_cache) >= KEY_CACHE_SIZE:
+                # Evict the oldest entry
+                del _key_cache[next(iter(_key_cache))]
+            _key_cache[digest] = keys
+    return keys
+
+
+def _account_for(private_key: str | bytes) -> LocalAccount:
+    """Cached LocalAccount for a private key"""
+    return _keys_for(private_key)[0]
+
+
+def _signing_key_for(private_key: str | bytes) -> coincurve.PrivateKey:
+    """Cached libsecp256k1 signing key for a private key"""
+    return _keys_for(private_key)[1]
+
+
+def _batch_unsupported(error: dict) -> bool:
+    """Whether a JSON-RPC batch entry error means the node refused the batch itself"""
+    # -32600 is "Invalid Request"; providers word batch limits differently
+    return error.get('code') == -32600 or 'batch' in str(error.get('message', '')).lower()
+
+
+class BatchSendError(ValueError):
+    """Raised when the node rejects some transactions of a batch send"""
+
+    def __init__(self, tx_hashes: list[str | None], errors: dict, base_nonce: int):
+        """
+        Args:
+            tx_hashes: Hash per transaction in submission order, None where rejected
+                or unanswered
+            errors: Node error per rejected transaction index, or 'no response'
+                where the reply lacked an entry; such a transaction may still land
+            base_nonce: Nonce of the first transaction; transaction i used base_nonce + i
+        """
+        self.tx_hashes = tx_hashes
+        self.errors = errors
+        self.base_nonce = base_nonce
+        accepted = len(tx_hashes) - len(errors)
+        super().__init__(
+            f"{len(errors)} of {len(tx_hashes)} transactions rejected "
+            f"({accepted} accepted); first error at index {min(errors)}: {errors[min(errors)]}"
+        )
 
 
 class WalletManager:
     """Manages Ethereum wallet operations using Web3.py"""
 
-    def __init__(self, rpc_url: str = "http://localhost:8545"):
+    def __init__(
+        self,
+        rpc_url: str = "http://localhost:8545",
+        async_mode: bool = False,
+        pool_size: int = 32
+    ):
         """
         Initialize wallet manager with RPC connection
 
         Args:
             rpc_url: Ethereum node RPC URL
+            async_mode: Also create an AsyncWeb3 client for concurrent batch reads
+            pool_size: Maximum pooled HTTP connections to the node, shared by all threads
         """
-        self.w3 = Web3(Web3.HTTPProvider(rpc_url))
+        self.w3 = Web3(SessionHTTPProvider(
+            rpc_url,
+            make_http_session(pool_size),
+            request_kwargs={'timeout': HTTP_TIMEOUT}
+        ))
         if not self.w3.is_connected():
             raise ConnectionError(f"Failed to connect to {rpc_url}")
-        print(f"✅ Connected to Ethereum node at {rpc_url}")
-        print(f"⛓️  Chain ID: {self.w3.eth.chain_id}")
-        print(f"📦 Latest block: {self.w3.eth.block_number}")
+
+        self.async_w3 = AsyncWeb3(SessionAsyncHTTPProvider(rpc_url)) if async_mode else None
+        # Concurrent batches sharing the open aiohttp session; see _async_eth
+        self._async_batches = 0
+
+        # Contracts keyed by (address, ABI digest); see _get_contract
+        self._contract_cache = {}
+        # Fee suggestions keyed by (blocks, percentile) as (timestamp, fees)
+        self._fee_cache = {}
+        # Gas limits as (timestamp, gas); see _cached_gas
+        self._gas_cache = {}
+
+        # Chain ID never changes for an endpoint; fetched once, on first use
+        # unless it is logged here; see chain_id
+        self._chain_id = None
+
+        logger.info("✅ Connected to Ethereum node at %s", rpc_url)
+        # Only read the chain for display when someone will see it, fetching
+        # chain ID and block number in a single round-trip
+        if logger.isEnabledFor(logging.INFO):
+            results = self._batch_request([('eth_chainId', []), ('eth_blockNumber', [])])
+            if results is not None:
+                self._chain_id, block_number = (int(value, 16) for value in results)
+            else:
+                self._chain_id = self.w3.eth.chain_id
+                block_number = self.w3.eth.block_number
+            logger.info("⛓️  Chain ID: %d", self._chain_id)
+            logger.info("📦 Latest block: %d", block_number)
+
+    @property
+    def chain_id(self) -> int:
+        """Chain ID of the connected node, fetched at most once"""
+        if self._chain_id is None:
+            self._chain_id = self.w3.eth.chain_id
+        return self._chain_id
+
+    def _batch_post(self, calls: list[tuple[str, list]]) -> list[dict] | None:
+        """
+        Send several JSON-RPC calls to the node in one HTTP request
+
+        Args:
+            calls: List of (method, params) pairs
+
+        Returns:
+            Raw response entries in call order (each with a result or an
+            error, or None where the node sent no matching reply), or None
+            if the provider can't batch
+        """
+        provider = self.w3.provider
+        if not isinstance(provider, HTTPProvider):
+            return None
+
+        payload = [
+            {'jsonrpc': '2.0', 'method': method, 'params': params, 'id': request_id}
+            for request_id, (method, params) in enumerate(calls)
+        ]
+        data = json.dumps(payload).encode()
+        try:
+            if isinstance(provider, SessionHTTPProvider):
+                raw_response = provider.post(data)
+            else:
+                raw_response = make_post_request(
+                    provider.endpoint_uri, data, **provider.get_request_kwargs()
+                )
+        except requests.HTTPError as e:
+            # Gateways that refuse batches answer with a 4xx such as 400 or 405
+            if e.response is not None and 400 <= e.response.status_code < 500:
+                return None
+            raise
+        responses = json.loads(raw_response)
+        # Some nodes answer a batch with a single error object instead of a list
+        if not isinstance(responses, list):
+            return None
+
+        entries = [None] * len(calls)
+        for response in responses:
+            # Replies with unknown ids are dropped; their slot stays None
+            request_id = response.get('id') if isinstance(response, dict) else None
+            if isinstance(request_id, int) and 0 <= request_id < len(calls):
+                entries[request_id] = response
+        return entries
+
+    def _batch_request(self, calls: list[tuple[str, list]]) -> list | None:
+        """
+        Send several JSON-RPC calls to the node in one HTTP request
+
+        Args:
+            calls: List of (method, params) pairs
+
+        Returns:
+            Raw results in call order, or None if the provider can't batch
+        """
+        entries = self._batch_post(calls)
+        # A short or mismatched reply is retried as single calls
+        if entries is None or None in entries:
+            return None
+        for entry in entries:
+            if 'error' in entry:
+                if _batch_unsupported(entry['error']):
+                    return None
+                raise ValueError(entry['error'])
+        return [entry['result'] for entry in entries]
+
+    def _get_contract(self, contract_address: str, abi: list):
+        """Return a Contract for the address and ABI, reusing an earlier instance"""
+        address = _checksum(contract_address)
+        key = (address, abi_digest(abi))
+        contract = self._contract_cache.get(key)
+        if contract is None:
+            contract = self._contract_cache[key] = self.w3.eth.contract(address=address, abi=abi)
+        return contract
 
     def create_wallet(self) -> tuple[str, str]:
         """
@@ -49,10 +476,108 @@ class WalletManager:
         Returns:
             Balance in ETH
         """
-        checksum_address = self.w3.to_checksum_address(address)
-        balance_wei = self.w3.eth.get_balance(checksum_address)
-        balance_eth = self.w3.from_wei(balance_wei, 'ether')
-        return Decimal(str(balance_eth))
+        return _from_wei(self.get_balance_wei(address))
+
+    def get_balance_wei(self, address: str) -> int:
+        """
+        Get balance of an address in wei, for polling loops that avoid Decimal
+
+        Args:
+            address: Ethereum address
+
+        Returns:
+            Balance in wei
+        """
+        return self.w3.eth.get_balance(_checksum(address))
+
+    def get_balances_batch(self, addresses: list[str]) -> list[Decimal]:
+        """
+        Get ETH balances of many addresses in a single JSON-RPC batch
+
+        Falls back to one request per address when the provider can't batch;
+        see get_balances for concurrent reads in async mode.
+
+        Args:
+            addresses: Ethereum addresses
+
+        Returns:
+            Balances in ETH, in the same order as addresses
+        """
+        return [_from_wei(balance_wei) for balance_wei in self.get_balances_batch_wei(addresses)]
+
+    def get_balances_batch_wei(self, addresses: list[str]) -> list[int]:
+        """
+        Get balances of many addresses in wei, in a single JSON-RPC batch
+
+        Args:
+            addresses: Ethereum addresses
+
+        Returns:
+            Balances in wei, in the same order as addresses
+        """
+        addresses = [_checksum(address) for address in addresses]
+        results = self._batch_request(
+            [('eth_getBalance', [address, 'latest']) for address in addresses]
+        )
+        if results is not None:
+            return [int(balance, 16) for balance in results]
+        return [self.w3.eth.get_balance(address) for address in addresses]
+
+    @contextlib.asynccontextmanager
+    async def _async_eth(self):
+        """
+        Yield the async eth module with a keep-alive session for one batch of reads
+
+        Overlapping batches share the session; it is closed when the last one ends.
+        """
+        if self.async_w3 is None:
+            raise RuntimeError("Concurrent reads require WalletManager(async_mode=True)")
+        provider = self.async_w3.provider
+        if self._async_batches == 0:
+            provider.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT),
+            )
+        self._async_batches += 1
+        try:
+            yield self.async_w3.eth
+        finally:
+            self._async_batches -= 1
+            if self._async_batches == 0:
+                session, provider.session = provider.session, None
+                await session.close()
+
+    async def get_balances(self, addresses: list[str]) -> list[Decimal]:
+        """
+        Get ETH balances of many addresses concurrently
+
+        Args:
+            addresses: Ethereum addresses
+
+        Returns:
+            Balances in ETH, in the same order as addresses
+        """
+        async with self._async_eth() as eth:
+            balances_wei = await asyncio.gather(
+                *(eth.get_balance(_checksum(address)) for address in addresses)
+            )
+        return [_from_wei(balance_wei) for balance_wei in balances_wei]
+
+    async def get_transaction_receipts(self, tx_hashes: list[str | bytes]) -> list[dict]:
+        """
+        Get receipts of many transactions concurrently
+
+        Args:
+            tx_hashes: Transaction hashes (hex strings or raw bytes)
+
+        Returns:
+            Receipt dictionaries, in the same order as tx_hashes
+        """
+        async with self._async_eth() as eth:
+            receipts = await asyncio.gather(
+                *(eth.get_transaction_receipt(tx_hash) for tx_hash in tx_hashes)
+            )
+        return [self._format_receipt(receipt) for receipt in receipts]
 
     def send_transaction(
         self,
@@ -75,28 +600,102 @@ class WalletManager:
             use_eip1559: Use dynamic fee market transaction with fee history oracle
 
         Returns:
-            Transaction hash
+            Transaction hash (hex string)
+        """
+        return self.send_transaction_raw(
+            private_key,
+            to_address,
+            amount_eth,
+            gas_price_gwei=gas_price_gwei,
+            gas_limit=gas_limit,
+            use_eip1559=use_eip1559
+        ).hex()
+
+    def send_transaction_raw(
+        self,
+        private_key: str,
+        to_address: str,
+        amount_eth: float,
+        gas_price_gwei: int = 50,
+        gas_limit: int | None = None,
+        use_eip1559: bool = False
+    ) -> bytes:
+        """
+        Send ETH transaction, returning the hash without hex encoding
+
+        Args:
+            private_key: Sender's private key
+            to_address: Recipient address
+            amount_eth: Amount in ETH
+            gas_price_gwei: Gas price in Gwei
+            gas_limit: Optional gas limit (auto-estimated when omitted)
+            use_eip1559: Use dynamic fee market transaction with fee history oracle
+
+        Returns:
+            32-byte transaction hash
         """
-        account = Account.from_key(private_key)
+        account = _account_for(private_key)
         from_address = account.address
+        to_address = _checksum(to_address)
+
+        fee_key = (FEE_HISTORY_BLOCKS, FEE_PERCENTILE)
+        fees = self._cached_fees(fee_key) if use_eip1559 else None
+        value = self.w3.to_wei(amount_eth, 'ether')
+        # Codeless recipients are keyed on the address alone; contract estimates
+        # also depend on the sender, selector (empty for plain transfers) and value
+        code_key = (to_address,)
+        estimate_key = (from_address, to_address, b'', value)
+        if gas_limit is None:
+            gas_limit = self._cached_gas(code_key) or self._cached_gas(estimate_key)
+
+        # Fetch nonce plus whatever isn't cached (fee history, recipient code)
+        # in a single round-trip
+        calls = {'nonce': ('eth_getTransactionCount', [from_address, 'latest'])}
+        if use_eip1559 and fees is None:
+            calls['fees'] = ('eth_feeHistory', [hex(FEE_HISTORY_BLOCKS), 'latest', [FEE_PERCENTILE]])
+        if gas_limit is None:
+            calls['code'] = ('eth_getCode', [to_address, 'latest'])
+        results = self._batch_request(list(calls.values()))
+        if results is not None:
+            results = dict(zip(calls, results))
+            nonce = int(results['nonce'], 16)
+            code = results.get('code')
+            if 'fees' in results:
+                fee_history = results['fees']
+                fees = self._store_fees(fee_key, self._fees_from_history({
+                    'baseFeePerGas': [int(fee, 16) for fee in fee_history['baseFeePerGas']],
+                    'reward': [
+                        [int(reward, 16) for reward in block_rewards]
+                        for block_rewards in fee_history.get('reward', [])
+                    ],
+                }))
+        else:
+            nonce = self.w3.eth.get_transaction_count(from_address)
+            code = self.w3.eth.get_code(to_address) if 'code' in calls else None
 
-        nonce = self.w3.eth.get_transaction_count(from_address)
         base_tx = {
             'nonce': nonce,
-            'to': self.w3.to_checksum_address(to_address),
-            'value': self.w3.to_wei(amount_eth, 'ether'),
-            'chainId': self.w3.eth.chain_id,
+            'to': to_address,
+            'value': value,
+            'chainId': self.chain_id,
             'from': from_address,
         }
 
         if gas_limit is None:
-            try:
-                gas_limit = self.w3.eth.estimate_gas(base_tx)
-            except Exception:
+            if code in (b'', '0x'):
+                # Transfers to an account without code always cost exactly 21000
                 gas_limit = 21000
+                self._store_gas(code_key, gas_limit)
+            else:
+                try:
+                    gas_limit = self.w3.eth.estimate_gas(base_tx)
+                    self._store_gas(estimate_key, gas_limit)
+                except Exception:
+                    gas_limit = 21000
 
         if use_eip1559:
-            fees = self.estimate_dynamic_fees()
+            if fees is None:
+                fees = self.estimate_dynamic_fees(*fee_key)
             tx = {
                 **base_tx,
                 'gas': gas_limit,
@@ -111,16 +710,80 @@ class WalletManager:
                 'gasPrice': self.w3.to_wei(gas_price_gwei, 'gwei'),
             }
 
-        # Sign and send
-        signed_tx = self.w3.eth.account.sign_transaction(tx, private_key)
-        tx_hash = self.w3.eth.send_raw_transaction(signed_tx.rawTransaction)
+        # Sign with the cached account rather than re-parsing the key
+        signed_tx = account.sign_transaction(tx)
+        return self.w3.eth.send_raw_transaction(signed_tx.rawTransaction)
+
+    def send_transactions_batch(self, private_key: str, txs: list[dict]) -> list[str]:
+        """
+        Sign and send several transactions from one account
+
+        The nonce is fetched once and incremented locally, and all signed
+        transactions are submitted in a single JSON-RPC batch when the
+        provider supports it.
+
+        Args:
+            private_key: Sender's private key
+            txs: Transaction dicts with to, value, gas and fee fields;
+                nonce, chainId and from are filled in
+
+        Returns:
+            Transaction hashes (hex strings), in the same order as txs
+
+        Raises:
+            BatchSendError: if the node rejected any transaction; it carries
+                the hashes of the transactions that were accepted
+        """
+        account = _account_for(private_key)
+        from_address = account.address
+        base_nonce = self.w3.eth.get_transaction_count(from_address, 'pending')
+
+        raw_txs = []
+        for offset, tx in enumerate(txs):
+            tx = {'chainId': self.chain_id, **tx, 'from': from_address, 'nonce': base_nonce + offset}
+            if tx.get('to'):
+                tx['to'] = _checksum(tx['to'])
+            raw_txs.append(bytes(account.sign_transaction(tx).rawTransaction))
+
+        tx_hashes = [None] * len(raw_txs)
+        errors = {}
+        entries = self._batch_post(
+            [('eth_sendRawTransaction', ['0x' + raw_tx.hex()]) for raw_tx in raw_txs]
+        )
+        unsent = range(len(raw_txs))
+        if entries is not None:
+            unsent = []
+            for index, entry in enumerate(entries):
+                if entry is None:
+                    # The node may have accepted it, so never resend
+                    errors[index] = 'no response'
+                elif 'error' not in entry:
+                    tx_hashes[index] = entry['result']
+                elif _batch_unsupported(entry['error']):
+                    # The node refused the batch itself, so this one never got in
+                    unsent.append(index)
+                else:
+                    errors[index] = entry['error']
+        for index in unsent:
+            try:
+                tx_hashes[index] = self.w3.eth.send_raw_transaction(raw_txs[index]).hex()
+            except Exception as e:
+                errors[index] = e
 
-        return tx_hash.hex()
+        if errors:
+            raise BatchSendError(tx_hashes, errors, base_nonce)
+        return tx_hashes
 
-    def estimate_dynamic_fees(self, blocks: int = 5, percentile: int = 60) -> dict:
+    def estimate_dynamic_fees(
+        self,
+        blocks: int = FEE_HISTORY_BLOCKS,
+        percentile: int = FEE_PERCENTILE
+    ) -> dict:
         """
         Suggest EIP-1559 fee parameters using fee_history oracle.
 
+        Results are reused for FEE_CACHE_TTL seconds.
+
         Args:
             blocks: Number of recent blocks to sample
             percentile: Priority fee percentile to target (0-100)
@@ -128,10 +791,53 @@ class WalletManager:
         Returns:
             Dictionary with baseFeeWei, priorityFeeWei, maxFeeWei and Gwei conversions
         """
-        history = self.w3.eth.fee_history(blocks, 'latest', [percentile])
+        fees = self._cached_fees((blocks, percentile))
+        if fees is None:
+            history = self.w3.eth.fee_history(blocks, 'latest', [percentile])
+            fees = self._store_fees((blocks, percentile), self._fees_from_history(history))
+        return fees
+
+    def _cached_gas(self, key: tuple) -> int | None:
+        """Return a gas limit cached less than GAS_CACHE_TTL seconds ago, if any"""
+        cached = self._gas_cache.get(key)
+        if cached is not None and time.monotonic() - cached[0] < GAS_CACHE_TTL:
+            return cached[1]
+        return None
+
+    def _store_gas(self, key: tuple, gas_limit: int) -> None:
+        """Remember a gas limit for GAS_CACHE_TTL seconds"""
+        self._gas_cache[key] = (time.monotonic(), gas_limit)
+
+    def _cached_fees(self, key: tuple[int, int]) -> dict | None:
+        """Return a copy of a fee suggestion younger than FEE_CACHE_TTL, if any"""
+        cached = self._fee_cache.get(key)
+        if cached is not None and time.monotonic() - cached[0] < FEE_CACHE_TTL:
+            return dict(cached[1])
+        return None
+
+    def _store_fees(self, key: tuple[int, int], fees: dict) -> dict:
+        """Remember a fee suggestion and return it"""
+        self._fee_cache[key] = (time.monotonic(), fees)
+        return dict(fees)
+
+    def _fees_from_history(self, history: dict) -> dict:
+        """
+        Derive EIP-1559 fee parameters from a fee_history result
+
+        Args:
+            history: fee_history result with integer baseFeePerGas and reward values
+
+        Returns:
+            Dictionary with baseFeeWei, priorityFeeWei, maxFeeWei and Gwei conversions
+        """
+        # The last entry is the base fee of the next (pending) block
         base_fee_wei = int(history['baseFeePerGas'][-1])
-        rewards = history.get('reward', [[self.w3.to_wei(2, 'gwei')]])
-        priority_fee_wei = int(rewards[-1][0]) if rewards and rewards[-1] else self.w3.to_wei(2, 'gwei')
+        # Take the upper median across all sampled blocks rather than trusting
+        # the most recent block alone
+        rewards = sorted(
+            int(block_rewards[0]) for block_rewards in history.get('reward') or [] if block_rewards
+        )
+        priority_fee_wei = rewards[len(rewards) // 2] if rewards else self.w3.to_wei(2, 'gwei')
         # Be defensive against sudden base fee doubling
         max_fee_wei = base_fee_wei * 2 + priority_fee_wei
 
@@ -139,22 +845,26 @@ class WalletManager:
             'baseFeeWei': base_fee_wei,
             'priorityFeeWei': priority_fee_wei,
             'maxFeeWei': max_fee_wei,
-            'baseFeeGwei': Decimal(str(self.w3.from_wei(base_fee_wei, 'gwei'))),
-            'priorityFeeGwei': Decimal(str(self.w3.from_wei(priority_fee_wei, 'gwei'))),
-            'maxFeeGwei': Decimal(str(self.w3.from_wei(max_fee_wei, 'gwei'))),
+            'baseFeeGwei': _from_wei(base_fee_wei, GWEI),
+            'priorityFeeGwei': _from_wei(priority_fee_wei, GWEI),
+            'maxFeeGwei': _from_wei(max_fee_wei, GWEI),
         }
 
-    def get_transaction_receipt(self, tx_hash: str) -> dict:
+    def get_transaction_receipt(self, tx_hash: str | bytes) -> dict:
         """
         Get transaction receipt
 
         Args:
-            tx_hash: Transaction hash
+            tx_hash: Transaction hash (hex string or raw bytes)
 
         Returns:
             Receipt dictionary
         """
-        receipt = self.w3.eth.get_transaction_receipt(tx_hash)
+        return self._format_receipt(self.w3.eth.get_transaction_receipt(tx_hash))
+
+    @staticmethod
+    def _format_receipt(receipt) -> dict:
+        """Reduce a raw receipt to the fields exposed by this tool"""
         return {
             'status': 'success' if receipt['status'] == 1 else 'failed',
             'blockNumber': receipt['blockNumber'],
@@ -182,10 +892,7 @@ class WalletManager:
         Returns:
             Function return value
         """
-        contract = self.w3.eth.contract(
-            address=self.w3.to_checksum_address(contract_address),
-            abi=abi
-        )
+        contract = self._get_contract(contract_address, abi)
         return getattr(contract.functions, function_name)(*args).call()
 
     def sign_message(self, private_key: str, message: str) -> str:
@@ -199,16 +906,17 @@ class WalletManager:
         Returns:
             Signature (hex string)
         """
-        account = Account.from_key(private_key)
-        # Use EIP-191 message encoding (same format as MetaMask)
-        message_encoded = encode_defunct(text=message)
-        signed = account.sign_message(message_encoded)
-        return signed.signature.hex()
+        # Sign the EIP-191 digest directly with libsecp256k1 instead of going
+        # through eth_account's SignableMessage wrappers
+        digest = _eip191_digest(message)
+        signature = _signing_key_for(private_key).sign_recoverable(digest, hasher=None)
+        # coincurve returns r || s || recovery_id; Ethereum expects v = 27 + recovery_id
+        return '0x' + (signature[:64] + bytes([signature[64] + 27])).hex()
 
     def verify_signature(
         self,
         message: str,
-        signature: str,
+        signature: str | bytes,
         expected_address: str
     ) -> bool:
         """
@@ -216,21 +924,28 @@ class WalletManager:
 
         Args:
             message: Original message
-            signature: Signature to verify (hex string with or without 0x prefix)
+            signature: Signature to verify (raw bytes, or hex string with or without 0x prefix)
             expected_address: Expected signer address
 
         Returns:
             True if signature is valid
         """
-        # Use EIP-191 message encoding (same format as MetaMask)
-        message_encoded = encode_defunct(text=message)
-        # Remove 0x prefix if present
-        sig_bytes = bytes.fromhex(signature[2:] if signature.startswith('0x') else signature)
-        recovered_address = Account.recover_message(
-            message_encoded,
-            signature=sig_bytes
+        digest = _eip191_digest(message)
+        if isinstance(signature, (bytes, bytearray)):
+            sig_bytes = bytes(signature)
+        else:
+            sig_bytes = binascii.unhexlify(_strip0x(signature))
+        if len(sig_bytes) != 65:
+            raise ValueError(f"Signature must be 65 bytes, got {len(sig_bytes)}")
+
+        # Ethereum encodes v as 27/28; libsecp256k1 expects the raw recovery id
+        v = sig_bytes[64]
+        recoverable = sig_bytes[:64] + bytes([v - 27 if v >= 27 else v])
+        public_key = coincurve.PublicKey.from_signature_and_message(
+            recoverable, digest, hasher=None
         )
-        return recovered_address.lower() == expected_address.lower()
+        recovered_address = _keccak32(public_key.format(compressed=False)[1:])[-20:]
+        return '0x' + recovered_address.hex() == expected_address.lower()
 
 
 def main():
@@ -241,7 +956,7 @@ Web3 Wallet Manager CLI
 
 Usage:
   python wallet_manager.py create                    Create new wallet
-  python wallet_manager.py balance <address>         Get ETH balance
+  python wallet_manager.py balance <address> [...]   Get ETH balance(s)
   python wallet_manager.py send <key> <to> <amount>  Send ETH
   python wallet_manager.py send1559 <key> <to> <amount>  Send ETH with dynamic fees
   python wallet_manager.py fees                      Show EIP-1559 fee suggestion
@@ -252,6 +967,10 @@ Environment Variables:
         """)
         sys.exit(1)
 
+    # Status lines go to stdout with the command output, as the earlier prints did;
+    # library warnings stay on stderr
+    logger.addHandler(logging.StreamHandler(sys.stdout))
+    logger.setLevel(logging.INFO)
     rpc_url = os.getenv('WEB3_RPC_URL', 'http://localhost:8545')
     manager = WalletManager(rpc_url)
 
@@ -266,12 +985,18 @@ Environment Variables:
 
     elif command == 'balance':
         if len(sys.argv) < 3:
-            print("Usage: python wallet_manager.py balance <address>")
+            print("Usage: python wallet_manager.py balance <address> [address ...]")
             sys.exit(1)
-        address = sys.argv[2]
-        balance = manager.get_balance(address)
-        print(f"\n💰 Balance of {address}")
-        print(f"{balance} ETH")
+        addresses = sys.argv[2:]
+        if len(addresses) == 1:
+            balance_wei = manager.get_balance_wei(addresses[0])
+            print(f"\n💰 Balance of {addresses[0]}")
+            print(f"{format_eth(balance_wei)} ETH")
+        else:
+            balances_wei = manager.get_balances_batch_wei(addresses)
+            print(f"\n💰 Balances of {len(addresses)} addresses")
+            for address, balance_wei in zip(addresses, balances_wei):
+                print(f"{address}: {format_eth(balance_wei)} ETH")
 
     elif command == 'send':
         if len(sys.argv) < 5:
@@ -282,9 +1007,9 @@ Environment Variables:
         amount = float(sys.argv[4])
 
         print(f"\n📤 Sending {amount} ETH to {to_address}...")
-        tx_hash = manager.send_transaction(private_key, to_address, amount)
+        tx_hash = manager.send_transaction_raw(private_key, to_address, amount)
         print(f"✅ Transaction sent!")
-        print(f"TX Hash: {tx_hash}")
+        print(f"TX Hash: {tx_hash.hex()}")
 
     elif command == 'send1559':
         if len(sys.argv) < 5:
@@ -296,12 +1021,12 @@ Environment Variables:
 
         fees = manager.estimate_dynamic_fees()
         print("\n⛽ Using dynamic fee market suggestions:")
-        print(f"  Base fee: {fees['baseFeeGwei']} gwei")
-        print(f"  Priority fee: {fees['priorityFeeGwei']} gwei")
-        print(f"  Max fee: {fees['maxFeeGwei']} gwei")
+        print(f"  Base fee: {format_units(fees['baseFeeWei'], 9)} gwei")
+        print(f"  Priority fee: {format_units(fees['priorityFeeWei'], 9)} gwei")
+        print(f"  Max fee: {format_units(fees['maxFeeWei'], 9)} gwei")
 
         print(f"\n📤 Sending {amount} ETH to {to_address} with EIP-1559 fees...")
-        tx_hash = manager.send_transaction(
+        tx_hash = manager.send_transaction_raw(
             private_key,
             to_address,
             amount,
@@ -309,14 +1034,17 @@ Environment Variables:
             gas_limit=25000,
         )
         print(f"✅ Transaction sent!")
-        print(f"TX Hash: {tx_hash}")
+        print(f"TX Hash: {tx_hash.hex()}")
 
     elif command == 'fees':
         fees = manager.estimate_dynamic_fees()
         print("\n📊 EIP-1559 Fee Recommendation")
-        print(f"Base fee: {fees['baseFeeGwei']} gwei")
-        print(f"Priority fee (@60th percentile): {fees['priorityFeeGwei']} gwei")
-        print(f"Max fee (base*2 + priority): {fees['maxFeeGwei']} gwei")
+        print(f"Base fee: {format_units(fees['baseFeeWei'], 9)} gwei")
+        print(
+            f"Priority fee (median @{FEE_PERCENTILE}th percentile over "
+            f"{FEE_HISTORY_BLOCKS} blocks): {format_units(fees['priorityFeeWei'], 9)} gwei"
+        )
+        print(f"Max fee (base*2 + priority): {format_units(fees['maxFeeWei'], 9)} gwei")
 
     elif command == 'sign':
         if len(sys.argv) < 4:
@@ -10,49 +10,56 @@ Example:
 """
 
 import argparse
+import asyncio
 import json
-import subprocess
+import os
 import sys
-from web3 import Web3
+
+# Run eth_keys (key derivation, signing) on libsecp256k1 rather than pure Python
+os.environ.setdefault('ECC_BACKEND_CLASS', 'eth_keys.backends.CoinCurveECCBackend')
+
+import aiohttp
+from web3 import AsyncHTTPProvider, AsyncWeb3
 from eth_account import Account
 
 
 def compile_contract():
-    """Compile the Vyper contract"""
+    """
+    Compile the Vyper contract
+
+    Raises RuntimeError rather than exiting, since this runs in a worker thread
+    where SystemExit would not stop the script.
+    """
     print("📦 Compiling ERC20Token.vy...")
 
     try:
-        # Get ABI
-        abi_result = subprocess.run(
-            ['vyper', '-f', 'abi', 'ERC20Token.vy'],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        abi = json.loads(abi_result.stdout)
-
-        # Get bytecode
-        bytecode_result = subprocess.run(
-            ['vyper', '-f', 'bytecode', 'ERC20Token.vy'],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        bytecode = bytecode_result.stdout.strip()
+        from vyper import compile_code
+    except ImportError:
+        raise RuntimeError("Vyper compiler not found.\nInstall with: pip install vyper") from None
 
-        print("✅ Compilation successful!")
-        return {'abi': abi, 'bytecode': bytecode}
+    with open('ERC20Token.vy', 'r') as f:
+        source = f.read()
 
-    except FileNotFoundError:
-        print("❌ Error: Vyper compiler not found.")
-        print("Install with: pip install vyper")
-        sys.exit(1)
-    except subprocess.CalledProcessError as e:
-        print(f"❌ Compilation failed: {e.stderr}")
-        sys.exit(1)
+    # Compile in-process, producing both artifacts in a single pass
+    try:
+        output = compile_code(source, output_formats=['abi', 'bytecode'])
+    except Exception as e:
+        raise RuntimeError(f"Compilation failed: {e}") from e
+
+    print("✅ Compilation successful!")
+    return {'abi': output['abi'], 'bytecode': output['bytecode']}
+
+
+def write_json(path, data):
+    """Write compact JSON in one buffered write, replacing the file atomically"""
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w') as f:
+        f.write(json.dumps(data, separators=(',', ':')))
+    os.replace(tmp_path, path)
 
 
-def deploy_contract(w3, compiled, deployer_account, name, symbol, decimals, supply):
+async def deploy_contract(w3, compiled, deployer_account, name, symbol, decimals, supply,
+                          chain_id, nonce, gas_price):
     """Deploy the contract"""
     print(f"\n🚀 Deploying {name} ({symbol})...")
     print(f"   Decimals: {decimals}")
@@ -65,17 +72,18 @@ def deploy_contract(w3, compiled, deployer_account, name, symbol, decimals, supp
         bytecode=compiled['bytecode']
     )
 
-    # Build constructor transaction
-    construct_txn = Contract.constructor(
+    # Build constructor transaction; every field is supplied, so no RPCs are made
+    construct_txn = await Contract.constructor(
         name,
         symbol,
         decimals,
         supply
     ).build_transaction({
         'from': deployer_account.address,
-        'nonce': w3.eth.get_transaction_count(deployer_account.address),
+        'nonce': nonce,
         'gas': 2000000,
-        'gasPrice': w3.eth.gas_price
+        'gasPrice': gas_price,
+        'chainId': chain_id
     })
 
     # Sign transaction
@@ -83,12 +91,12 @@ def deploy_contract(w3, compiled, deployer_account, name, symbol, decimals, supp
 
     # Send transaction
     print("📤 Sending deployment transaction...")
-    tx_hash = w3.eth.send_raw_transaction(signed_txn.rawTransaction)
+    tx_hash = await w3.eth.send_raw_transaction(signed_txn.rawTransaction)
     print(f"   Transaction hash: {tx_hash.hex()}")
 
     # Wait for confirmation
     print("⏳ Waiting for confirmation...")
-    tx_receipt = w3.eth.wait_for_transaction_receipt(tx_hash)
+    tx_receipt = await w3.eth.wait_for_transaction_receipt(tx_hash)
 
     if tx_receipt.status == 1:
         print(f"✅ Contract deployed successfully!")
@@ -112,13 +120,12 @@ def deploy_contract(w3, compiled, deployer_account, name, symbol, decimals, supp
             }
         }
 
-        with open('deployment_info.json', 'w') as f:
-            json.dump(deployment_info, f, indent=2)
+        # Save deployment info and ABI side by side
+        await asyncio.gather(
+            asyncio.to_thread(write_json, 'deployment_info.json', deployment_info),
+            asyncio.to_thread(write_json, 'ERC20Token_abi.json', compiled['abi']),
+        )
         print("\n💾 Deployment info saved to deployment_info.json")
-
-        # Save ABI
-        with open('ERC20Token_abi.json', 'w') as f:
-            json.dump(compiled['abi'], f, indent=2)
         print("💾 ABI saved to ERC20Token_abi.json")
 
         return tx_receipt.contractAddress
@@ -127,7 +134,7 @@ def deploy_contract(w3, compiled, deployer_account, name, symbol, decimals, supp
         sys.exit(1)
 
 
-def main():
+async def main():
     parser = argparse.ArgumentParser(description='Deploy ERC20Token.vy contract')
     parser.add_argument('--network', required=True, help='RPC URL')
     parser.add_argument('--private-key', required=True, help='Deployer private key')
@@ -143,35 +150,50 @@ def main():
 
     # Connect to network
     print(f"\n🌐 Connecting to {args.network}...")
-    w3 = Web3(Web3.HTTPProvider(args.network))
-
-    if not w3.is_connected():
-        print("❌ Failed to connect to network")
-        sys.exit(1)
-
-    print(f"✅ Connected! Chain ID: {w3.eth.chain_id}")
-
-    # Load deployer account
-    deployer_account = Account.from_key(args.private_key)
-    balance = w3.eth.get_balance(deployer_account.address)
-    print(f"💰 Deployer balance: {w3.from_wei(balance, 'ether')} ETH")
-
-    if balance == 0:
-        print("⚠️  Warning: Deployer has zero balance!")
-
-    # Compile contract
-    compiled = compile_contract()
-
-    # Deploy contract
-    contract_address = deploy_contract(
-        w3,
-        compiled,
-        deployer_account,
-        args.name,
-        args.symbol,
-        args.decimals,
-        args.supply
-    )
+    async with aiohttp.ClientSession() as session:
+        provider = AsyncHTTPProvider(args.network)
+        await provider.cache_async_session(session)
+        w3 = AsyncWeb3(provider)
+
+        if not await w3.is_connected():
+            print("❌ Failed to connect to network")
+            sys.exit(1)
+
+        # Load deployer account
+        deployer_account = Account.from_key(args.private_key)
+
+        # Independent reads overlap each other and the compilation
+        try:
+            compiled, chain_id, balance, nonce, gas_price = await asyncio.gather(
+                asyncio.to_thread(compile_contract),
+                w3.eth.chain_id,
+                w3.eth.get_balance(deployer_account.address),
+                w3.eth.get_transaction_count(deployer_account.address),
+                w3.eth.gas_price,
+            )
+        except RuntimeError as e:
+            print(f"❌ Error: {e}")
+            sys.exit(1)
+
+        print(f"✅ Connected! Chain ID: {chain_id}")
+        print(f"💰 Deployer balance: {w3.from_wei(balance, 'ether')} ETH")
+
+        if balance == 0:
+            print("⚠️  Warning: Deployer has zero balance!")
+
+        # Deploy contract
+        contract_address = await deploy_contract(
+            w3,
+            compiled,
+            deployer_account,
+            args.name,
+            args.symbol,
+            args.decimals,
+            args.supply,
+            chain_id,
+            nonce,
+            gas_price
+        )
 
     print("\n" + "=" * 50)
     print("🎉 Deployment complete!")
@@ -180,4 +202,4 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
+    asyncio.run(main())
@@ -1,15 +1,36 @@
 """
 Test suite for ERC20Token.vy
 """
+import functools
+import re
 import pytest
 from eth_tester import EthereumTester
 from web3 import Web3
 from web3.providers.eth_tester import EthereumTesterProvider
-import json
-import subprocess
+import os
+
+# Minimal read aggregator: forwards each static call and returns the raw results,
+# so a batch of view calls costs a single eth_call
+MULTICALL_SOURCE = """
+# @version ^0.3.10
+
+MAX_CALLS: constant(uint256) = 16
+
+@external
+@view
+def aggregate(
+    targets: DynArray[address, MAX_CALLS], data: DynArray[Bytes[100], MAX_CALLS]
+) -> DynArray[Bytes[32], MAX_CALLS]:
+    results: DynArray[Bytes[32], MAX_CALLS] = []
+    for i in range(MAX_CALLS):
+        if i >= len(targets):
+            break
+        results.append(raw_call(targets[i], data[i], max_outsize=32, is_static_call=True))
+    return results
+"""
 
 
-@pytest.fixture
+@pytest.fixture(scope='session')
 def w3():
     """Create a Web3 instance with EthereumTester backend"""
     tester = EthereumTester()
@@ -17,50 +38,102 @@ def w3():
     return Web3(provider)
 
 
-@pytest.fixture
+@pytest.fixture(scope='session')
 def accounts(w3):
     """Get test accounts"""
     return w3.eth.accounts
 
 
-@pytest.fixture
+@functools.lru_cache(maxsize=256)
+def encode_call(contract, fn_name, args):
+    """Calldata for a view call, encoded once per (contract, function, args)"""
+    return contract.encodeABI(fn_name=fn_name, args=list(args))
+
+
+# Types whose ABI encoding is one 32-byte word, so raw_call's max_outsize=32 holds it whole
+STATIC_WORD_TYPE = re.compile(r'u?int\d*|address|bool|bytes([1-9]|[12]\d|3[0-2])')
+
+
+@functools.lru_cache(maxsize=64)
+def output_types(contract, fn_name):
+    """ABI output types of a contract function, looked up once"""
+    types = [output['type'] for output in contract.get_function_by_name(fn_name).abi['outputs']]
+    assert len(types) == 1 and STATIC_WORD_TYPE.fullmatch(types[0]), (
+        f"{fn_name} returns {types}; read_many needs one static output of at most 32 bytes"
+    )
+    return types
+
+
+@pytest.fixture(scope='session')
 def contract_source():
     """Read the Vyper contract source code"""
     with open('ERC20Token.vy', 'r') as f:
         return f.read()
 
 
-@pytest.fixture
-def compiled_contract(contract_source):
-    """Compile the Vyper contract"""
-    # Compile using vyper command-line tool
+@pytest.fixture(scope='session')
+def compiled_contract(request, contract_source):
+    """Compile the Vyper contract once per session"""
     try:
-        # Get ABI
-        abi_result = subprocess.run(
-            ['vyper', '-f', 'abi', 'ERC20Token.vy'],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        abi = json.loads(abi_result.stdout)
-
-        # Get bytecode
-        bytecode_result = subprocess.run(
-            ['vyper', '-f', 'bytecode', 'ERC20Token.vy'],
-            capture_output=True,
-            text=True,
-            check=True
-        )
-        bytecode = bytecode_result.stdout.strip()
-
-        return {'abi': abi, 'bytecode': bytecode}
-    except FileNotFoundError:
+        import vyper
+    except ImportError:
         pytest.skip("Vyper compiler not found. Install with: pip install vyper")
-    except subprocess.CalledProcessError as e:
-        pytest.fail(f"Vyper compilation failed: {e.stderr}")
 
+    # Reuse artifacts from previous runs until the source or compiler changes;
+    # the cache is absent under -p no:cacheprovider
+    cache = getattr(request.config, 'cache', None)
+    cache_key = f"{os.path.getmtime('ERC20Token.vy')}:{vyper.__version__}"
+    cached = cache.get('erc20/compiled_contract', None) if cache is not None else None
+    if cached and cached.get('key') == cache_key:
+        return {'abi': cached['abi'], 'bytecode': cached['bytecode']}
 
-@pytest.fixture
+    try:
+        output = vyper.compile_code(contract_source, output_formats=['abi', 'bytecode'])
+    except Exception as e:
+        pytest.fail(f"Vyper compilation failed: {e}")
+
+    compiled = {'abi': output['abi'], 'bytecode': output['bytecode']}
+    if cache is not None:
+        cache.set('erc20/compiled_contract', {'key': cache_key, **compiled})
+    return compiled
+
+
+@pytest.fixture(scope='session')
+def compiled_multicall():
+    """Compile the read aggregator once per session"""
+    vyper = pytest.importorskip('vyper', reason="Vyper compiler not found. Install with: pip install vyper")
+    return vyper.compile_code(MULTICALL_SOURCE, output_formats=['abi', 'bytecode'])
+
+
+@pytest.fixture(scope='session')
+def multicall(w3, accounts, compiled_multicall):
+    """Deploy the read aggregator"""
+    Multicall = w3.eth.contract(
+        abi=compiled_multicall['abi'],
+        bytecode=compiled_multicall['bytecode']
+    )
+    tx_hash = Multicall.constructor().transact({'from': accounts[0]})
+    tx_receipt = w3.eth.wait_for_transaction_receipt(tx_hash)
+    return w3.eth.contract(
+        address=tx_receipt.contractAddress,
+        abi=compiled_multicall['abi']
+    )
+
+
+@pytest.fixture(scope='session')
+def read_many(w3, multicall):
+    """Return a helper that performs several view calls in one eth_call"""
+    def read_many(contract, calls):
+        data = [encode_call(contract, name, args) for name, args in calls]
+        results = multicall.functions.aggregate([contract.address] * len(calls), data).call()
+        return [
+            w3.codec.decode(output_types(contract, name), result)[0]
+            for (name, _), result in zip(calls, results)
+        ]
+    return read_many
+
+
+@pytest.fixture(scope='session')
 def token_contract(w3, accounts, compiled_contract):
     """Deploy the ERC20 token contract"""
     # Deploy contract
@@ -86,6 +159,15 @@ def token_contract(w3, accounts, compiled_contract):
     return contract
 
 
+@pytest.fixture(autouse=True)
+def _snapshot(w3, token_contract, multicall):
+    """Run each test against the freshly deployed state, rolling back afterwards"""
+    tester = w3.provider.ethereum_tester
+    snapshot_id = tester.take_snapshot()
+    yield
+    tester.revert_to_snapshot(snapshot_id)
+
+
 class TestERC20Token:
     """Test cases for ERC20Token contract"""
 
@@ -101,15 +183,16 @@ class TestERC20Token:
         assert token_contract.functions.totalSupply().call() == expected_supply
         assert token_contract.functions.balanceOf(accounts[0]).call() == expected_supply
 
-    def test_transfer(self, w3, token_contract, accounts):
+    def test_transfer(self, w3, token_contract, accounts, read_many):
         """Test token transfer"""
         sender = accounts[0]
         recipient = accounts[1]
         amount = 1000 * 10**18  # 1000 tokens
 
+        balances = [('balanceOf', (sender,)), ('balanceOf', (recipient,))]
+
         # Get initial balances
-        sender_balance_before = token_contract.functions.balanceOf(sender).call()
-        recipient_balance_before = token_contract.functions.balanceOf(recipient).call()
+        sender_balance_before, recipient_balance_before = read_many(token_contract, balances)
 
         # Transfer tokens
         tx_hash = token_contract.functions.transfer(
@@ -118,8 +201,10 @@ class TestERC20Token:
         w3.eth.wait_for_transaction_receipt(tx_hash)
 
         # Check balances after transfer
-        assert token_contract.functions.balanceOf(sender).call() == sender_balance_before - amount
-        assert token_contract.functions.balanceOf(recipient).call() == recipient_balance_before + amount
+        assert read_many(token_contract, balances) == [
+            sender_balance_before - amount,
+            recipient_balance_before + amount,
+        ]
 
     def test_transfer_insufficient_balance(self, w3, token_contract, accounts):
         """Test transfer with insufficient balance fails"""
@@ -148,7 +233,7 @@ class TestERC20Token:
         # Check allowance
         assert token_contract.functions.allowance(owner, spender).call() == amount
 
-    def test_transfer_from(self, w3, token_contract, accounts):
+    def test_transfer_from(self, w3, token_contract, accounts, read_many):
         """Test transferFrom with allowance"""
         owner = accounts[0]
         spender = accounts[1]
@@ -161,9 +246,10 @@ class TestERC20Token:
         ).transact({'from': owner})
         w3.eth.wait_for_transaction_receipt(tx_hash)
 
+        balances = [('balanceOf', (owner,)), ('balanceOf', (recipient,))]
+
         # Get balances before
-        owner_balance_before = token_contract.functions.balanceOf(owner).call()
-        recipient_balance_before = token_contract.functions.balanceOf(recipient).call()
+        owner_balance_before, recipient_balance_before = read_many(token_contract, balances)
 
         # Transfer from owner to recipient via spender
         tx_hash = token_contract.functions.transferFrom(
@@ -171,12 +257,12 @@ class TestERC20Token:
         ).transact({'from': spender})
         w3.eth.wait_for_transaction_receipt(tx_hash)
 
-        # Check balances after
-        assert token_contract.functions.balanceOf(owner).call() == owner_balance_before - amount
-        assert token_contract.functions.balanceOf(recipient).call() == recipient_balance_before + amount
-
-        # Check allowance is reduced
-        assert token_contract.functions.allowance(owner, spender).call() == 0
+        # Check balances after and that the allowance is reduced
+        assert read_many(token_contract, balances + [('allowance', (owner, spender))]) == [
+            owner_balance_before - amount,
+            recipient_balance_before + amount,
+            0,
+        ]
 
     def test_transfer_from_insufficient_allowance(self, w3, token_contract, accounts):
         """Test transferFrom with insufficient allowance fails"""
@@ -192,14 +278,14 @@ class TestERC20Token:
             ).transact({'from': spender})
             w3.eth.wait_for_transaction_receipt(tx_hash)
 
-    def test_mint(self, w3, token_contract, accounts):
+    def test_mint(self, w3, token_contract, accounts, read_many):
         """Test minting new tokens (owner only)"""
         owner = accounts[0]
         recipient = accounts[1]
         mint_amount = 10000 * 10**18
 
-        total_supply_before = token_contract.functions.totalSupply().call()
-        recipient_balance_before = token_contract.functions.balanceOf(recipient).call()
+        reads = [('totalSupply', ()), ('balanceOf', (recipient,))]
+        total_supply_before, recipient_balance_before = read_many(token_contract, reads)
 
         # Mint tokens
         tx_hash = token_contract.functions.mint(
@@ -207,11 +293,11 @@ class TestERC20Token:
         ).transact({'from': owner})
         w3.eth.wait_for_transaction_receipt(tx_hash)
 
-        # Check total supply increased
-        assert token_contract.functions.totalSupply().call() == total_supply_before + mint_amount
-
-        # Check recipient balance increased
-        assert token_contract.functions.balanceOf(recipient).call() == recipient_balance_before + mint_amount
+        # Check total supply and recipient balance increased
+        assert read_many(token_contract, reads) == [
+            total_supply_before + mint_amount,
+            recipient_balance_before + mint_amount,
+        ]
 
     def test_mint_non_owner(self, w3, token_contract, accounts):
         """Test that non-owner cannot mint"""
@@ -225,13 +311,13 @@ class TestERC20Token:
             ).transact({'from': non_owner})
             w3.eth.wait_for_transaction_receipt(tx_hash)
 
-    def test_burn(self, w3, token_contract, accounts):
+    def test_burn(self, w3, token_contract, accounts, read_many):
         """Test burning tokens"""
         account = accounts[0]
         burn_amount = 1000 * 10**18
 
-        total_supply_before = token_contract.functions.totalSupply().call()
-        balance_before = token_contract.functions.balanceOf(account).call()
+        reads = [('totalSupply', ()), ('balanceOf', (account,))]
+        total_supply_before, balance_before = read_many(token_contract, reads)
 
         # Burn tokens
         tx_hash = token_contract.functions.burn(
@@ -239,11 +325,11 @@ class TestERC20Token:
         ).transact({'from': account})
         w3.eth.wait_for_transaction_receipt(tx_hash)
 
-        # Check total supply decreased
-        assert token_contract.functions.totalSupply().call() == total_supply_before - burn_amount
-
-        # Check balance decreased
-        assert token_contract.functions.balanceOf(account).call() == balance_before - burn_amount
+        # Check total supply and balance decreased
+        assert read_many(token_contract, reads) == [
+            total_supply_before - burn_amount,
+            balance_before - burn_amount,
+        ]
 
     def test_burn_insufficient_balance(self, w3, token_contract, accounts):
         """Test burning more than balance fails"""